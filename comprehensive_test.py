@@ -9,9 +9,7 @@ It provides a complete status report of what works and what has limitations.
 import sys
 import subprocess
 import importlib
-import time
 import traceback
-from pathlib import Path
 
 
 class ComprehensiveTestSuite:
@@ -103,6 +101,8 @@ class ComprehensiveTestSuite:
             'pyaudio': 'Audio input/output (system dependent)',
             'transformers': 'HuggingFace AI models',
             'torch': 'AI/ML backend',
+            'orjson': 'Fast student profile JSON',
+            'uvloop': 'Fast WebSocket event loop',
         }
         
         # Test Python packages
@@ -119,7 +119,9 @@ class ComprehensiveTestSuite:
                     'speech_recognition': 'pip install SpeechRecognition',
                     'pyaudio': 'sudo apt-get install portaudio19-dev; pip install pyaudio',
                     'transformers': 'pip install transformers>=4.21.0',
-                    'torch': 'pip install torch>=2.0.0'
+                    'torch': 'pip install torch>=2.0.0',
+                    'orjson': 'pip install orjson',
+                    'uvloop': 'pip install uvloop (not available on Windows)'
                 }
                 rec = recommendations.get(module_name, f"pip install {module_name}")
                 self.log_test('optional_deps', module_name, False, str(e), rec)
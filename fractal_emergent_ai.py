@@ -18,6 +18,7 @@ import matplotlib.pyplot as plt
 import asyncio
 import threading
 import logging
+from collections import deque
 from fractal_modules import (
     get_dynamic_neighborhood,
     param_vector_leaky_relu,
@@ -32,6 +33,14 @@ from fractal_modules import (
 )
 from websocket_communication import WebSocketCommunicator
 
+# Optional Dependencies Handling: uvloop runs the WebSocket thread's event loop
+# faster; fall back to the default asyncio loop
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
@@ -65,10 +74,11 @@ class FractalEmergentAI:
         self.websocket_enabled = False
         self.websocket_thread = None
         self.websocket_loop = None
+        self._shutdown_event = None  # Set on the WebSocket loop to stop it
         
         # AI insights and communication
         self.last_insights = []
-        self.communication_log = []
+        self.communication_log = deque(maxlen=1000)  # Bounded: oldest entries are evicted
 
     def step(self, lr=0.0011):
         new_state = np.zeros_like(self.state)
@@ -120,11 +130,12 @@ class FractalEmergentAI:
         
         response = f"Fractal AI Analysis: Current system state shows mean={gmean:.3f}, std={gstd:.3f}, entropy={entropy:.3f}. "
         
-        if "pattern" in question.lower():
+        question_lower = question.lower()
+        if "pattern" in question_lower:
             response += "Detecting complex emergent patterns in the fractal space."
-        elif "learn" in question.lower():
+        elif "learn" in question_lower:
             response += "Continuous meta-learning is active across all dimensions."
-        elif "state" in question.lower():
+        elif "state" in question_lower:
             response += f"System is evolving with {np.sum(self.state > 0.5)} activated nodes."
         else:
             response += "Processing through recursive fractal dynamics."
@@ -138,10 +149,11 @@ class FractalEmergentAI:
         self.communication_log.append(f"Answer received: {answer}")
         
         # Process the answer and potentially adjust AI parameters
-        if "math" in answer.lower():
+        answer_lower = answer.lower()
+        if "math" in answer_lower:
             # If it's about math, increase logical processing
             self.dynamic_params[:, :, :, 1] *= 1.01  # Boost hierarchical attention
-        elif "creative" in answer.lower():
+        elif "creative" in answer_lower:
             # If it's about creativity, increase variability
             self.dynamic_params[:, :, :, 0] *= 1.02  # Boost neighborhood dynamics
     
@@ -195,8 +207,12 @@ class FractalEmergentAI:
             return
         
         def run_websocket():
-            self.websocket_loop = asyncio.new_event_loop()
+            if UVLOOP_AVAILABLE:
+                self.websocket_loop = uvloop.new_event_loop()
+            else:
+                self.websocket_loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.websocket_loop)
+            self._shutdown_event = asyncio.Event()
             
             async def websocket_main():
                 try:
@@ -212,9 +228,10 @@ class FractalEmergentAI:
                     if connected:
                         logging.info("Fractal AI connected to target")
                     
-                    # Keep running
-                    while self.websocket_enabled:
-                        await asyncio.sleep(1)
+                    # Keep running (idle, no polling) until stopped; the flag
+                    # covers a stop that came before the event existed
+                    if self.websocket_enabled:
+                        await self._shutdown_event.wait()
                         
                 except Exception as e:
                     logging.error(f"WebSocket error: {e}")
@@ -233,11 +250,9 @@ class FractalEmergentAI:
         """Stop WebSocket communication."""
         if self.websocket_enabled:
             self.websocket_enabled = False
-            if self.websocket_loop and not self.websocket_loop.is_closed():
-                asyncio.run_coroutine_threadsafe(
-                    self.websocket_communicator.stop(), 
-                    self.websocket_loop
-                )
+            # websocket_main stops the communicator once the event is set
+            if self._shutdown_event and self.websocket_loop and not self.websocket_loop.is_closed():
+                self.websocket_loop.call_soon_threadsafe(self._shutdown_event.set)
             if self.websocket_thread:
                 self.websocket_thread.join(timeout=5)
             logging.info("WebSocket communication stopped")
@@ -279,7 +294,7 @@ class FractalEmergentAI:
     
     def get_communication_log(self):
         """Get the communication log."""
-        return self.communication_log.copy()
+        return list(self.communication_log)
     
     def get_stats(self):
         """Get AI and communication statistics."""
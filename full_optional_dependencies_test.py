@@ -7,6 +7,7 @@ including availability, functionality, and fallback mechanisms.
 """
 
 import sys
+import shutil
 import subprocess
 import importlib
 import time
@@ -45,9 +46,9 @@ class FullOptionalDependenciesTest:
         try:
             if dep_name == 'espeak':
                 # System dependency
-                result = subprocess.run(['which', 'espeak'], capture_output=True, text=True)
-                if result.returncode == 0:
-                    version_result = subprocess.run(['espeak', '--version'], capture_output=True, text=True)
+                espeak_path = shutil.which('espeak')
+                if espeak_path:
+                    version_result = subprocess.run([espeak_path, '--version'], capture_output=True, text=True)
                     version = version_result.stdout.strip().split('\n')[0] if version_result.returncode == 0 else 'unknown'
                     return True, version
                 else:
@@ -209,8 +210,7 @@ class FullOptionalDependenciesTest:
         """Test espeak system functionality."""
         try:
             # Test espeak availability
-            result = subprocess.run(['which', 'espeak'], capture_output=True, text=True)
-            if result.returncode != 0:
+            if shutil.which('espeak') is None:
                 return "FAIL", "espeak not found in system PATH"
             
             # Test espeak version
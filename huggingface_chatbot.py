@@ -9,10 +9,15 @@ using state-of-the-art conversational AI from HuggingFace transformers.
 """
 
 import os
+import re
 import sys
+import itertools
 import logging
+import random
+import threading
 import time
 import warnings
+from collections import OrderedDict
 from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 
@@ -35,6 +40,52 @@ except ImportError as e:
     logger.warning(f"HuggingFace transformers not available: {e}")
     logger.warning("Install with: pip install transformers torch")
 
+# Set TEACHER1_ONNX=1 to run BlenderBot on ONNX Runtime (needs optimum[onnxruntime]).
+# The exported, INT8-quantized model is cached here per model name.
+USE_ONNX = os.environ.get("TEACHER1_ONNX") == "1"
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "teacher1", "onnx")
+
+# A small seq2seq model gains nothing from more intra-op threads than this;
+# extra threads just contend. Applied once, when a model is first loaded.
+# Set TEACHER1_PIN_THREADS=1 to also pin OpenMP threads to cores (KMP_AFFINITY).
+TORCH_NUM_THREADS = min(4, os.cpu_count() or 1)
+PIN_THREADS = os.environ.get("TEACHER1_PIN_THREADS") == "1"
+_torch_threads_configured = False
+
+
+def _configure_torch_threads():
+    """
+    Limit PyTorch CPU threading for BlenderBot (first call only).
+    
+    Thread counts the user exported (OMP_NUM_THREADS etc.) are left alone.
+    """
+    global _torch_threads_configured
+    if _torch_threads_configured:
+        return
+    _torch_threads_configured = True
+    
+    if "OMP_NUM_THREADS" not in os.environ:
+        torch.set_num_threads(TORCH_NUM_THREADS)
+    os.environ.setdefault("OMP_NUM_THREADS", str(TORCH_NUM_THREADS))
+    os.environ.setdefault("MKL_NUM_THREADS", str(TORCH_NUM_THREADS))
+    os.environ.setdefault("KMP_BLOCKTIME", "1")
+    if PIN_THREADS:
+        os.environ.setdefault("KMP_AFFINITY", "granularity=fine,compact,1,0")
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Already set, or inter-op work has started in this process
+
+# Whole-word phrases that end the conversation ("quite" must not match "quit")
+SESSION_END_RE = re.compile(r"\b(?:bye|goodbye|see you|quit|exit)\b", re.IGNORECASE)
+
+# Model replies containing any of these words are replaced with a fallback
+NEGATIVE_WORDS = frozenset({"stupid", "dumb", "bad", "wrong", "hate", "hates", "hated"})
+WORD_RE = re.compile(r"[a-z]+")
+
+# Replies remembered per exact model context when decoding is greedy (LRU)
+RESPONSE_CACHE_SIZE = 128
+
 
 class HuggingFaceBlenderBotChatbot:
     """
@@ -45,21 +96,51 @@ class HuggingFaceBlenderBotChatbot:
     features of Teacher1 with natural dialogue capabilities.
     """
     
-    def __init__(self, model_name: str = "facebook/blenderbot-400M-distill"):
+    def __init__(self, model_name: str = "facebook/blenderbot-400M-distill",
+                 sampling: bool = False, quantize: bool = True,
+                 assistant_model_name: Optional[str] = None,
+                 background_load: bool = False, load_in_4bit: bool = False):
         """
         Initialize the HuggingFace BlenderBot chatbot.
         
         Args:
             model_name: HuggingFace model identifier for BlenderBot
+            sampling: Use temperature/top-p sampling instead of greedy decoding.
+                Greedy decoding is deterministic, skips the per-step top-p sort
+                and is compatible with CUDA-graph capture; replies vary less,
+                which the fallback responses partly make up for.
+            quantize: On CPU, quantize the Linear layers to INT8 after loading.
+                Cuts weight memory traffic ~4x for faster generation at a small
+                cost in reply quality. Ignored on GPU.
+            assistant_model_name: Smaller BlenderBot checkpoint that shares the
+                main model's tokenizer (e.g. facebook/blenderbot-400M-distill
+                for facebook/blenderbot-3B). It drafts tokens for assisted
+                (speculative) generation, which the main model verifies in one
+                forward pass. Leave unset for the default 400M model.
+            background_load: Load the model in a daemon thread so construction
+                returns immediately. Replies wait for loading to finish;
+                is_model_available() reports False until then.
+            load_in_4bit: On GPU, load the Linear weights as 4-bit NF4 via
+                bitsandbytes (FP16 compute), for cards with limited VRAM.
+                Falls back to FP16 if bitsandbytes is not installed. Ignored on CPU.
         """
         self.model_name = model_name
+        self.sampling = sampling
+        self.quantize = quantize
+        self.load_in_4bit = load_in_4bit
+        self.assistant_model_name = assistant_model_name
+        self.assistant_model = None
         self.model = None
         self.tokenizer = None
+        self._system_prompt_ids = None
+        self._int32_input_ids = False  # Set for the PyTorch CPU model at load
+        self._response_cache = OrderedDict()  # context -> decoded reply
         self.current_student = None
         self.current_session_id = None
         self.session_start_time = None
         self.conversation_history = []
         self.max_history_length = 10  # Keep last 10 exchanges
+        self.max_context_tokens = 192  # Prompt + last 2 exchanges fit well within this
         
         # Educational context prompts
         self.educational_context = {
@@ -77,8 +158,24 @@ class HuggingFaceBlenderBotChatbot:
             ]
         }
         
-        # Initialize the model if available
-        self._initialize_model()
+        # Fallback replies go round a shuffled copy of the list
+        fallback_responses = self.educational_context["fallback_responses"]
+        self._fallback_cycle = itertools.cycle(random.sample(fallback_responses, len(fallback_responses)))
+        
+        # Initialize the model if available (set once loading has finished,
+        # whether or not it succeeded)
+        self._model_ready = threading.Event()
+        if background_load:
+            threading.Thread(target=self._initialize_model_and_signal, daemon=True).start()
+        else:
+            self._initialize_model_and_signal()
+    
+    def _initialize_model_and_signal(self):
+        """Initialize the model, then mark loading as finished."""
+        try:
+            self._initialize_model()
+        finally:
+            self._model_ready.set()
     
     def _initialize_model(self) -> bool:
         """
@@ -100,14 +197,40 @@ class HuggingFaceBlenderBotChatbot:
                 
                 # Load tokenizer and model
                 self.tokenizer = BlenderbotTokenizer.from_pretrained(self.model_name)
-                self.model = BlenderbotForConditionalGeneration.from_pretrained(self.model_name)
+                # Drop the oldest history first when the context exceeds max_context_tokens
+                self.tokenizer.truncation_side = "left"
+                
+                # The system prompt never changes, so tokenize it once here
+                # instead of re-running BPE over it on every turn
+                self._system_prompt_ids = self.tokenizer(
+                    self.educational_context['system_prompt'],
+                    add_special_tokens=False,
+                    return_tensors="pt"
+                ).input_ids
                 
-                # Move to GPU if available
-                if torch.cuda.is_available():
-                    self.model = self.model.cuda()
-                    logger.info("Model loaded on GPU")
+                self.model = self._load_onnx_model() if USE_ONNX else None
+                if self.model is not None:
+                    logger.info("Model loaded on ONNX Runtime (CPU)")
                 else:
-                    logger.info("Model loaded on CPU")
+                    if self.load_in_4bit and torch.cuda.is_available():
+                        self.model = self._load_4bit_model()
+                    if self.model is not None:
+                        logger.info("Model loaded on GPU (4-bit NF4)")
+                    else:
+                        self.model = self._load_pretrained_model()
+                        
+                        # Move to GPU if available
+                        if torch.cuda.is_available():
+                            self.model = self.model.cuda()
+                            logger.info("Model loaded on GPU")
+                        else:
+                            if self.quantize:
+                                self.model = self._quantize_model(self.model)
+                            self._int32_input_ids = True
+                            logger.info("Model loaded on CPU")
+                    
+                    if self.assistant_model_name:
+                        self.assistant_model = self._load_assistant_model()
             
             logger.info("BlenderBot model initialized successfully")
             return True
@@ -117,6 +240,162 @@ class HuggingFaceBlenderBotChatbot:
             logger.warning("Falling back to simple response generation")
             return False
     
+    def _load_pretrained_model(self, model_name: Optional[str] = None):
+        """
+        Load BlenderBot weights, preferring PyTorch's fused SDPA attention.
+        
+        Weights are loaded in FP16 when a GPU is available, halving memory
+        traffic per decoder step; on CPU they stay FP32 (INT8 after quantization).
+        
+        Args:
+            model_name: Checkpoint to load (defaults to self.model_name)
+        
+        Returns:
+            BlenderbotForConditionalGeneration: The loaded model
+        """
+        _configure_torch_threads()
+        model_name = model_name or self.model_name
+        dtype = torch.float16 if torch.cuda.is_available() else torch.float32
+        try:
+            return BlenderbotForConditionalGeneration.from_pretrained(
+                model_name, attn_implementation="sdpa", torch_dtype=dtype
+            )
+        except (TypeError, ValueError) as e:
+            # Older transformers releases (or models without SDPA support)
+            # reject the kwarg; fall back to the default attention path
+            logger.info(f"SDPA attention unavailable, using default attention: {e}")
+            return BlenderbotForConditionalGeneration.from_pretrained(model_name, torch_dtype=dtype)
+    
+    def _load_assistant_model(self):
+        """
+        Load the draft model for assisted generation on the main model's device.
+        
+        Returns:
+            BlenderbotForConditionalGeneration, or None if it cannot be loaded
+        """
+        try:
+            assistant = self._load_pretrained_model(self.assistant_model_name)
+            if torch.cuda.is_available():
+                assistant = assistant.cuda()
+            elif self.quantize:
+                assistant = self._quantize_model(assistant)
+            logger.info(f"Assisted generation enabled with {self.assistant_model_name}")
+            return assistant.eval()
+        except Exception as e:
+            logger.warning(f"Could not load assistant model {self.assistant_model_name}: {e}")
+            return None
+    
+    def _load_onnx_model(self):
+        """
+        Load BlenderBot on ONNX Runtime with full graph optimization.
+        
+        The first run exports the model to ONNX and quantizes it to INT8
+        (dynamic, AVX512-VNNI kernels) under ONNX_CACHE_DIR; later runs load
+        the cached files. The ORT model has the same generate() API.
+        
+        Returns:
+            ORTModelForSeq2SeqLM, or None to fall back to PyTorch
+        """
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        except ImportError as e:
+            logger.warning(f"ONNX Runtime requested but unavailable: {e}")
+            logger.warning("Install with: pip install optimum[onnxruntime]")
+            return None
+        
+        model_dir = os.path.join(ONNX_CACHE_DIR, self.model_name.replace("/", "--"))
+        export_dir = os.path.join(model_dir, "export")
+        quantized_dir = os.path.join(model_dir, "int8")
+        onnx_files = ("encoder_model.onnx", "decoder_model.onnx", "decoder_with_past_model.onnx")
+        encoder, decoder, decoder_with_past = quantized_files = tuple(
+            name.replace(".onnx", "_quantized.onnx") for name in onnx_files
+        )
+        
+        try:
+            if not all(os.path.exists(os.path.join(quantized_dir, name)) for name in quantized_files):
+                logger.info(f"Exporting {self.model_name} to ONNX (first run only)")
+                exported = ORTModelForSeq2SeqLM.from_pretrained(
+                    self.model_name, export=True, use_merged=False
+                )
+                exported.save_pretrained(export_dir)
+                
+                qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+                for file_name in onnx_files:
+                    quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=file_name)
+                    quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+            
+            session_options = onnxruntime.SessionOptions()
+            session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            
+            return ORTModelForSeq2SeqLM.from_pretrained(
+                quantized_dir,
+                encoder_file_name=encoder,
+                decoder_file_name=decoder,
+                decoder_with_past_file_name=decoder_with_past,
+                session_options=session_options
+            )
+        except Exception as e:
+            logger.warning(f"ONNX Runtime setup failed, using PyTorch: {e}")
+            return None
+    
+    def _load_4bit_model(self):
+        """
+        Load BlenderBot with 4-bit NF4 weights on the GPU.
+        
+        Only the Linear layers are quantized; the embeddings and lm_head stay
+        FP16, which preserves most of the reply quality.
+        
+        Returns:
+            BlenderbotForConditionalGeneration, or None to fall back to FP16
+        """
+        try:
+            import bitsandbytes  # noqa: F401 - required by the 4-bit config
+            from transformers import BitsAndBytesConfig
+        except ImportError as e:
+            logger.warning(f"4-bit loading requested but unavailable: {e}")
+            logger.warning("Install with: pip install bitsandbytes")
+            return None
+        
+        try:
+            quantization_config = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=torch.float16,
+                llm_int8_skip_modules=["lm_head"]
+            )
+            return BlenderbotForConditionalGeneration.from_pretrained(
+                self.model_name,
+                quantization_config=quantization_config,
+                torch_dtype=torch.float16,
+                device_map="auto"
+            )
+        except Exception as e:
+            logger.warning(f"4-bit loading failed, using FP16: {e}")
+            return None
+    
+    def _quantize_model(self, model):
+        """
+        Apply dynamic INT8 quantization to the model's Linear layers.
+        
+        Args:
+            model: FP32 BlenderBot model on CPU
+            
+        Returns:
+            The quantized model, or the original one if quantization fails
+        """
+        try:
+            model.eval()
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            logger.info("Applied dynamic INT8 quantization to Linear layers")
+        except Exception as e:
+            # No quantized CPU backend on this platform; keep FP32 weights
+            logger.info(f"Dynamic quantization unavailable, using FP32 weights: {e}")
+        return model
+    
     def start_session(self, student_name: str) -> str:
         """
         Start a new conversation session.
@@ -142,6 +421,7 @@ class HuggingFaceBlenderBotChatbot:
         if self.current_student:
             greeting_input = f"Hello {self.current_student}! I'm an AI assistant here to chat and help with learning."
             
+            self._model_ready.wait()
             if self.model and self.tokenizer:
                 try:
                     response = self._generate_response(greeting_input, is_greeting=True)
@@ -171,7 +451,7 @@ class HuggingFaceBlenderBotChatbot:
         
         try:
             # Check for session end
-            if any(phrase in user_input.lower() for phrase in ['bye', 'goodbye', 'see you', 'quit', 'exit']):
+            if SESSION_END_RE.search(user_input):
                 return self.end_session(), {"type": "session_end"}
             
             # Generate response using model or fallback
@@ -207,6 +487,7 @@ class HuggingFaceBlenderBotChatbot:
         Returns:
             str: Generated response
         """
+        self._model_ready.wait()
         if not self.model or not self.tokenizer:
             return self._get_fallback_response()
         
@@ -214,32 +495,19 @@ class HuggingFaceBlenderBotChatbot:
             # Prepare conversation context
             context = self._prepare_conversation_context(user_input, is_greeting)
             
-            # Tokenize input
-            inputs = self.tokenizer(context, return_tensors="pt", truncation=True, max_length=512)
-            
-            # Move to same device as model
-            if torch.cuda.is_available() and self.model.device.type == 'cuda':
-                inputs = {k: v.cuda() for k, v in inputs.items()}
-            
-            # Generate response
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs["input_ids"],
-                    max_length=150,
-                    min_length=10,
-                    do_sample=True,
-                    temperature=0.7,
-                    top_p=0.9,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    no_repeat_ngram_size=3
-                )
-            
-            # Decode response
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            
-            # Clean up response (remove input echo if present)
-            if context in response:
-                response = response.replace(context, "").strip()
+            # Greedy decoding is deterministic, so a context seen before
+            # (greetings, opening lines like "hi") reuses the earlier reply
+            if self.sampling:
+                response = self._run_model(context)
+            else:
+                response = self._response_cache.get(context)
+                if response is None:
+                    response = self._run_model(context)
+                    self._response_cache[context] = response
+                    if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                        self._response_cache.popitem(last=False)
+                else:
+                    self._response_cache.move_to_end(context)
             
             # Ensure response is appropriate and not empty
             if not response or len(response.strip()) < 3:
@@ -254,10 +522,76 @@ class HuggingFaceBlenderBotChatbot:
             logger.warning(f"Error in model generation: {e}")
             return self._get_fallback_response()
     
+    def _run_model(self, context: str) -> str:
+        """
+        Run BlenderBot generation on a prepared context.
+        
+        Args:
+            context: Context string from _prepare_conversation_context
+            
+        Returns:
+            str: Decoded model output
+        """
+        # Tokenize input (system prompt IDs are prepended from the cache)
+        input_ids = self._encode_conversation_context(context)
+        
+        # Move to same device as model
+        if torch.cuda.is_available() and self.model.device.type == 'cuda':
+            input_ids = input_ids.cuda()
+        
+        # Generate response
+        if self.sampling:
+            decoding_kwargs = {"do_sample": True, "temperature": 0.7, "top_p": 0.9}
+        else:
+            decoding_kwargs = {"do_sample": False, "num_beams": 1}
+        if self.assistant_model is not None:
+            decoding_kwargs["assistant_model"] = self.assistant_model
+        
+        # The embedding lookup on CPU is memory-bound; int32 IDs halve the
+        # bytes gathered per token. Fall back to int64 if generate rejects them.
+        if self._int32_input_ids:
+            try:
+                outputs = self._generate(input_ids.to(torch.int32), decoding_kwargs)
+            except (RuntimeError, TypeError) as e:
+                logger.info(f"int32 input IDs not supported, using int64: {e}")
+                self._int32_input_ids = False
+                outputs = self._generate(input_ids, decoding_kwargs)
+        else:
+            outputs = self._generate(input_ids, decoding_kwargs)
+        
+        # Decode response (BlenderBot is encoder-decoder, so the decoder
+        # output never echoes the context back and needs no stripping)
+        return self.tokenizer.decode(outputs[0], skip_special_tokens=True).strip()
+    
+    def _generate(self, input_ids: "torch.Tensor", decoding_kwargs: Dict) -> "torch.Tensor":
+        """
+        Call model.generate with the shared generation settings.
+        
+        Args:
+            input_ids: Encoder input IDs of shape (1, seq_len)
+            decoding_kwargs: Decoding strategy arguments (sampling/greedy, assistant)
+            
+        Returns:
+            torch.Tensor: Generated token IDs
+        """
+        with torch.no_grad():
+            return self.model.generate(
+                input_ids,
+                max_new_tokens=60,  # Replies are trimmed to 3 sentences anyway
+                min_length=10,
+                pad_token_id=self.tokenizer.eos_token_id,
+                no_repeat_ngram_size=3,
+                use_cache=True,
+                **decoding_kwargs
+            )
+    
     def _prepare_conversation_context(self, user_input: str, is_greeting: bool = False) -> str:
         """
         Prepare conversation context including history.
         
+        The system prompt is not included here; its token IDs are cached at
+        model load and prepended by _encode_conversation_context.
+        
         Args:
             user_input: Current user input
             is_greeting: Whether this is a greeting
@@ -266,10 +600,10 @@ class HuggingFaceBlenderBotChatbot:
             str: Formatted context for the model
         """
         if is_greeting:
-            return f"{self.educational_context['system_prompt']} {user_input}"
+            return user_input
         
         # Build context with recent conversation history
-        context_parts = [self.educational_context['system_prompt']]
+        context_parts = []
         
         # Add recent conversation history (last few exchanges)
         recent_history = self.conversation_history[-4:]  # Last 2 exchanges
@@ -283,6 +617,25 @@ class HuggingFaceBlenderBotChatbot:
         
         return " ".join(context_parts)
     
+    def _encode_conversation_context(self, context: str) -> "torch.Tensor":
+        """
+        Tokenize the per-turn context and prepend the cached system prompt IDs.
+        
+        Args:
+            context: Context string from _prepare_conversation_context
+            
+        Returns:
+            torch.Tensor: Input IDs of shape (1, seq_len)
+        """
+        prompt_length = self._system_prompt_ids.shape[1]
+        context_ids = self.tokenizer(
+            context,
+            return_tensors="pt",
+            truncation=True,
+            max_length=self.max_context_tokens - prompt_length
+        ).input_ids
+        return torch.cat([self._system_prompt_ids, context_ids], dim=1)
+    
     def _filter_educational_content(self, response: str) -> str:
         """
         Filter response to ensure educational appropriateness.
@@ -302,7 +655,7 @@ class HuggingFaceBlenderBotChatbot:
             response = '. '.join(sentences[:3]) + '.'
         
         # Ensure positive, educational tone
-        if any(word in response.lower() for word in ['stupid', 'dumb', 'bad', 'wrong', 'hate']):
+        if not NEGATIVE_WORDS.isdisjoint(WORD_RE.findall(response.lower())):
             return self._get_fallback_response()
         
         return response.strip()
@@ -321,8 +674,7 @@ class HuggingFaceBlenderBotChatbot:
     
     def _get_fallback_response(self) -> str:
         """Get a fallback response when model is unavailable."""
-        import random
-        return random.choice(self.educational_context["fallback_responses"])
+        return next(self._fallback_cycle)
     
     def end_session(self) -> str:
         """End the current conversation session."""
@@ -360,7 +712,20 @@ class HuggingFaceBlenderBotChatbot:
     
     def is_model_available(self) -> bool:
         """Check if the HuggingFace model is available and loaded."""
-        return self.model is not None and self.tokenizer is not None
+        return self._model_ready.is_set() and self.model is not None and self.tokenizer is not None
+    
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until model loading has finished (see background_load).
+        
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            bool: True if the model is loaded and available
+        """
+        self._model_ready.wait(timeout)
+        return self.is_model_available()
 
 
 # Example usage and testing
@@ -11,8 +11,10 @@ the conversational AI and other system components.
 
 import asyncio
 import logging
+import re
 import sys
 import os
+from collections import OrderedDict, deque
 from typing import Dict, Optional
 
 # Add project root to path
@@ -22,10 +24,36 @@ sys.path.insert(0, project_root)
 from websocket_communication import WebSocketCommunicator
 from huggingface_chatbot import HuggingFaceBlenderBotChatbot
 
+# Optional Dependencies Handling: uvloop runs the WebSocket event loop faster;
+# fall back to the default asyncio loop
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Educational questions sent round-robin by send_proactive_questions
+PROACTIVE_QUESTIONS = (
+    "What learning patterns are you observing in student interactions?",
+    "How can we make educational content more engaging for different learning styles?",
+    "What insights do you have about effective teaching methods?",
+    "How might we personalize learning experiences better?",
+    "What are some creative ways to assess student understanding?",
+    "How can we encourage more collaborative learning?",
+    "What role does storytelling play in education?",
+    "How can we make learning more fun and interactive?"
+)
+
+# Answers mentioning any of these (as substrings, e.g. "learning") are educational
+EDUCATIONAL_ANSWER_RE = re.compile(r"learn|teach|student|education", re.IGNORECASE)
+
+# Each question gets its own conversation entry; keep only the most recent ones
+MAX_ACTIVE_CONVERSATIONS = 1000
+
 
 class HuggingFaceWebSocketChatbot:
     """
@@ -61,10 +89,13 @@ class HuggingFaceWebSocketChatbot:
         
         # Initialize HuggingFace chatbot
         self.chatbot = HuggingFaceBlenderBotChatbot(model_name=model_name)
+        # Inference runs off the event loop; one reply at a time because the
+        # chatbot's conversation history is not thread-safe
+        self._chatbot_lock = asyncio.Lock()
         
         # Communication tracking
-        self.communication_log = []
-        self.active_conversations = {}  # conversation_id -> context
+        self.communication_log = deque(maxlen=1000)  # Bounded: oldest entries are evicted
+        self.active_conversations = OrderedDict()  # conversation_id -> context, oldest first
         
         # Set up WebSocket message handlers
         self.communicator.on_question_received = self._handle_question
@@ -92,8 +123,10 @@ class HuggingFaceWebSocketChatbot:
         logger.info(f"Received question from {sender}: {question}")
         
         try:
-            # Use chatbot to generate response
-            response, metadata = self.chatbot.get_response(question)
+            # Generate in a worker thread so model.generate does not stall
+            # the WebSocket handlers while it runs
+            async with self._chatbot_lock:
+                response, metadata = await asyncio.to_thread(self.chatbot.get_response, question)
             
             # Log the interaction
             self.communication_log.append(f"Responded to {sender}: {response}")
@@ -106,6 +139,8 @@ class HuggingFaceWebSocketChatbot:
                 "last_response": response,
                 "metadata": metadata
             }
+            if len(self.active_conversations) > MAX_ACTIVE_CONVERSATIONS:
+                self.active_conversations.popitem(last=False)
             
             return response
             
@@ -133,7 +168,7 @@ class HuggingFaceWebSocketChatbot:
         # For now, just log the interaction
         
         # If this is an educational context, we might want to acknowledge learning
-        if any(keyword in answer.lower() for keyword in ['learn', 'teach', 'student', 'education']):
+        if EDUCATIONAL_ANSWER_RE.search(answer):
             logger.info(f"Educational answer received from {sender}")
     
     async def _handle_ack(self, message: dict):
@@ -153,17 +188,6 @@ class HuggingFaceWebSocketChatbot:
         Args:
             interval: Seconds between proactive questions
         """
-        educational_questions = [
-            "What learning patterns are you observing in student interactions?",
-            "How can we make educational content more engaging for different learning styles?",
-            "What insights do you have about effective teaching methods?",
-            "How might we personalize learning experiences better?",
-            "What are some creative ways to assess student understanding?",
-            "How can we encourage more collaborative learning?",
-            "What role does storytelling play in education?",
-            "How can we make learning more fun and interactive?"
-        ]
-        
         question_index = 0
         
         while True:
@@ -171,7 +195,7 @@ class HuggingFaceWebSocketChatbot:
             
             # Only send if ready and connected
             if self.communicator.is_ready_to_send_question():
-                question = educational_questions[question_index % len(educational_questions)]
+                question = PROACTIVE_QUESTIONS[question_index % len(PROACTIVE_QUESTIONS)]
                 
                 try:
                     await self.communicator.send_question(question)
@@ -219,7 +243,7 @@ class HuggingFaceWebSocketChatbot:
     
     def get_communication_log(self) -> list:
         """Get the communication log for debugging/monitoring."""
-        return self.communication_log.copy()
+        return list(self.communication_log)
     
     def get_chatbot_status(self) -> dict:
         """Get status information about the chatbot."""
@@ -297,6 +321,8 @@ if __name__ == "__main__":
     print()
     
     # Run the chatbot
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(run_huggingface_chatbot(
         port=args.port,
         target_port=args.target_port,
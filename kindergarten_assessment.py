@@ -4,48 +4,90 @@ Kindergarten Learning Assessment Tool for Teacher1
 Provides detailed assessment and reporting capabilities for individual students.
 """
 
-import json
-import datetime
+import copy
+from bisect import bisect_right
+from datetime import datetime
+from heapq import nlargest
+from operator import itemgetter
 from typing import Dict, List, Tuple
 from student_profile import StudentProfileManager, KindergartenStudent
 
+# Recommendations for each primary learning style
+LEARNING_STYLE_RECS = {
+    "visual": (
+        "Use more visual aids, pictures, and colorful materials",
+        "Incorporate drawing and visual mapping activities"
+    ),
+    "auditory": (
+        "Include more songs, rhymes, and verbal instructions",
+        "Use storytelling and discussion-based learning"
+    ),
+    "kinesthetic": (
+        "Provide hands-on activities and movement-based learning",
+        "Use manipulatives and interactive games"
+    )
+}
+
+# Recommendations for a student showing signs of frustration
+FRUSTRATION_RECS = (
+    "Provide extra encouragement and celebrate small victories",
+    "Consider shorter learning sessions with more breaks"
+)
+
+# (attention span upper bound in seconds, recommendation), checked in order
+ATTENTION_RULES = (
+    (180, "Use very short activities (1-2 minutes) with frequent changes"),  # less than 3 minutes
+    (300, "Break lessons into 3-5 minute segments")  # less than 5 minutes
+)
+
+# Success-rate thresholds (ascending) and the status for each band between them
+MASTERY_THRESHOLDS = (0.5, 0.7, 0.9)
+MASTERY_LABELS = ("Needs support", "Developing", "Proficient", "Mastered")
+LEVEL_READINESS_THRESHOLDS = (0.7, 0.85)
+LEVEL_READINESS_LABELS = ("Continue at current level", "Nearly ready to advance", "Ready to advance")
+
 class KindergartenAssessment:
     """Assessment tool for analyzing kindergarten student progress."""
     
+    __slots__ = ("student_manager", "_assessment_cache")
+    
+    # Assessment criteria for kindergarten skills, indexed by level - 1
+    SKILL_LEVELS = {
+        "math": (
+            "Counting 1-5, basic number recognition",
+            "Counting 1-10, simple addition (1+1, 2+1)",
+            "Counting 1-20, addition/subtraction up to 5",
+            "Counting 1-50, addition/subtraction up to 10",
+            "Counting 1-100, basic problem solving"
+        ),
+        "reading": (
+            "Letter recognition A-M, basic phonics",
+            "Letter recognition A-Z, simple words",
+            "Three-letter words, basic sentences",
+            "Simple sentences, sight words",
+            "Short stories, reading comprehension"
+        ),
+        "spelling": (
+            "Name spelling, 3-letter words",
+            "Simple CVC words (cat, dog, sun)",
+            "4-letter words, common words",
+            "Simple sentences, familiar words",
+            "Complex words, creative writing"
+        ),
+        "numbers": (
+            "Numbers 1-10, counting objects",
+            "Numbers 1-20, number order",
+            "Numbers 1-50, skip counting",
+            "Numbers 1-100, number patterns",
+            "Large numbers, mathematical concepts"
+        )
+    }
+    
     def __init__(self):
         self.student_manager = StudentProfileManager()
         
-        # Assessment criteria for kindergarten skills
-        self.skill_levels = {
-            "math": {
-                1: "Counting 1-5, basic number recognition",
-                2: "Counting 1-10, simple addition (1+1, 2+1)",
-                3: "Counting 1-20, addition/subtraction up to 5",
-                4: "Counting 1-50, addition/subtraction up to 10",
-                5: "Counting 1-100, basic problem solving"
-            },
-            "reading": {
-                1: "Letter recognition A-M, basic phonics",
-                2: "Letter recognition A-Z, simple words",
-                3: "Three-letter words, basic sentences",
-                4: "Simple sentences, sight words",
-                5: "Short stories, reading comprehension"
-            },
-            "spelling": {
-                1: "Name spelling, 3-letter words",
-                2: "Simple CVC words (cat, dog, sun)",
-                3: "4-letter words, common words",
-                4: "Simple sentences, familiar words",
-                5: "Complex words, creative writing"
-            },
-            "numbers": {
-                1: "Numbers 1-10, counting objects",
-                2: "Numbers 1-20, number order",
-                3: "Numbers 1-50, skip counting",
-                4: "Numbers 1-100, number patterns",
-                5: "Large numbers, mathematical concepts"
-            }
-        }
+        # student_id -> ((sessions, total activities), assessment); reused until the student records new work
+        self._assessment_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
     
     def assess_student(self, student_name: str) -> Dict:
         """Generate comprehensive assessment for a student."""
@@ -53,46 +95,63 @@ class KindergartenAssessment:
         if not student:
             return {"error": f"Student {student_name} not found"}
         
+        # Every recorded activity bumps total_activities, including subjects
+        # outside progress that still change engagement and learning style
+        fingerprint = (len(student.sessions), student.total_activities)
+        cached = self._assessment_cache.get(student.student_id)
+        if cached and cached[0] == fingerprint:
+            # Deep copies on the way in and out, so callers editing the nested
+            # results cannot change what the cache returns next time
+            assessment = copy.deepcopy(cached[1])
+            assessment["assessment_date"] = datetime.now().isoformat()
+            return assessment
+        
+        # Per-subject (success_rate, attempts, level, score), shared by the helpers below
+        stats = {
+            subject: ((data['successes'] / data['attempts']) if data['attempts'] > 0 else 0,
+                      data['attempts'], data['level'], data['score'])
+            for subject, data in student.progress.items()
+        }
+        
         assessment = {
             "student_name": student.name,
             "student_id": student.student_id,
             "age": student.age,
-            "assessment_date": datetime.datetime.now().isoformat(),
+            "assessment_date": datetime.now().isoformat(),
             "total_sessions": len(student.sessions),
-            "learning_profile": self._assess_learning_profile(student),
-            "academic_progress": self._assess_academic_progress(student),
+            "learning_profile": self._assess_learning_profile(student, stats),
+            "academic_progress": self._assess_academic_progress(student, stats),
             "engagement_analysis": self._assess_engagement(student),
-            "recommendations": self._generate_recommendations(student),
-            "readiness_indicators": self._assess_readiness(student)
+            "recommendations": self._generate_recommendations(student, stats),
+            "readiness_indicators": self._assess_readiness(student, stats)
         }
         
+        self._assessment_cache[student.student_id] = (fingerprint, copy.deepcopy(assessment))
         return assessment
     
-    def _assess_learning_profile(self, student: KindergartenStudent) -> Dict:
+    def _assess_learning_profile(self, student: KindergartenStudent, stats: Dict) -> Dict:
         """Assess student's learning preferences and style."""
         return {
             "primary_learning_style": student.get_preferred_learning_style(),
             "learning_style_distribution": student.learning_style,
             "attention_span": f"{student.engagement['attention_span'] // 60} minutes",
             "engagement_pattern": self._analyze_engagement_pattern(student),
-            "preferred_subjects": self._identify_preferred_subjects(student)
+            "preferred_subjects": self._identify_preferred_subjects(student, stats)
         }
     
-    def _assess_academic_progress(self, student: KindergartenStudent) -> Dict:
+    def _assess_academic_progress(self, student: KindergartenStudent, stats: Dict) -> Dict:
         """Assess academic progress across all subjects."""
         progress = {}
         
-        for subject, data in student.progress.items():
-            success_rate = (data['successes'] / data['attempts']) if data['attempts'] > 0 else 0
-            
+        for subject, (success_rate, attempts, level, score) in stats.items():
             progress[subject] = {
-                "current_level": data['level'],
-                "skill_description": self.skill_levels[subject][data['level']],
-                "attempts": data['attempts'],
+                "current_level": level,
+                "skill_description": self.SKILL_LEVELS[subject][level - 1],
+                "attempts": attempts,
                 "success_rate": f"{success_rate:.1%}",
-                "total_score": data['score'],
-                "mastery_status": self._determine_mastery_status(success_rate, data['attempts']),
-                "next_level_readiness": self._assess_level_readiness(success_rate, data['attempts'])
+                "total_score": score,
+                "mastery_status": self._determine_mastery_status(success_rate, attempts),
+                "next_level_readiness": self._assess_level_readiness(success_rate, attempts)
             }
         
         return progress
@@ -124,58 +183,55 @@ class KindergartenAssessment:
             "needs_encouragement": student.is_frustrated()
         }
     
-    def _generate_recommendations(self, student: KindergartenStudent) -> List[str]:
+    def _generate_recommendations(self, student: KindergartenStudent, stats: Dict) -> List[str]:
         """Generate personalized learning recommendations."""
         recommendations = []
         
-        # Learning style recommendations
+        # Learning style recommendations (anything unrecognised is treated as kinesthetic)
         primary_style = student.get_preferred_learning_style()
-        if primary_style == "visual":
-            recommendations.append("Use more visual aids, pictures, and colorful materials")
-            recommendations.append("Incorporate drawing and visual mapping activities")
-        elif primary_style == "auditory":
-            recommendations.append("Include more songs, rhymes, and verbal instructions")
-            recommendations.append("Use storytelling and discussion-based learning")
-        else:  # kinesthetic
-            recommendations.append("Provide hands-on activities and movement-based learning")
-            recommendations.append("Use manipulatives and interactive games")
+        recommendations.extend(LEARNING_STYLE_RECS.get(primary_style, LEARNING_STYLE_RECS["kinesthetic"]))
         
         # Progress-based recommendations
-        for subject, data in student.progress.items():
-            if data['attempts'] > 0:
-                success_rate = data['successes'] / data['attempts']
-                if success_rate < 0.5:
-                    recommendations.append(f"Consider review and reinforcement in {subject}")
-                    recommendations.append(f"Break down {subject} concepts into smaller steps")
-                elif success_rate > 0.8 and data['attempts'] >= 5:
-                    recommendations.append(f"Ready to advance in {subject} - introduce new challenges")
+        recommendations.extend(
+            rec
+            for subject, (success_rate, attempts, _, _) in stats.items() if attempts > 0
+            for rec in self._subject_recommendations(subject, success_rate, attempts)
+        )
         
         # Engagement recommendations
         if student.is_frustrated():
-            recommendations.append("Provide extra encouragement and celebrate small victories")
-            recommendations.append("Consider shorter learning sessions with more breaks")
+            recommendations.extend(FRUSTRATION_RECS)
         
         # Attention span recommendations
-        if student.engagement['attention_span'] < 180:  # less than 3 minutes
-            recommendations.append("Use very short activities (1-2 minutes) with frequent changes")
-        elif student.engagement['attention_span'] < 300:  # less than 5 minutes
-            recommendations.append("Break lessons into 3-5 minute segments")
+        attention_span = student.engagement['attention_span']
+        attention_rec = next((rec for limit, rec in ATTENTION_RULES if attention_span < limit), None)
+        if attention_rec:
+            recommendations.append(attention_rec)
         
         return recommendations if recommendations else ["Continue current approach - student is progressing well"]
     
-    def _assess_readiness(self, student: KindergartenStudent) -> Dict:
+    def _subject_recommendations(self, subject: str, success_rate: float, attempts: int) -> Tuple[str, ...]:
+        """Recommendations for one subject the student has attempted."""
+        if success_rate < 0.5:
+            return (f"Consider review and reinforcement in {subject}",
+                    f"Break down {subject} concepts into smaller steps")
+        if success_rate > 0.8 and attempts >= 5:
+            return (f"Ready to advance in {subject} - introduce new challenges",)
+        return ()
+    
+    def _assess_readiness(self, student: KindergartenStudent, stats: Dict) -> Dict:
         """Assess readiness for various kindergarten milestones."""
         readiness = {}
         
         # Math readiness
-        math_score = self._calculate_readiness_score(student, 'math')
+        math_score = self._calculate_readiness_score(student, 'math', stats)
         readiness['mathematical_thinking'] = {
             "score": math_score,
             "ready_for": "Basic addition" if math_score >= 70 else "Number recognition practice"
         }
         
         # Reading readiness
-        reading_score = self._calculate_readiness_score(student, 'reading')
+        reading_score = self._calculate_readiness_score(student, 'reading', stats)
         readiness['reading_readiness'] = {
             "score": reading_score,
             "ready_for": "Simple words" if reading_score >= 70 else "Letter sound practice"
@@ -194,17 +250,16 @@ class KindergartenAssessment:
         
         return readiness
     
-    def _calculate_readiness_score(self, student: KindergartenStudent, subject: str) -> int:
+    def _calculate_readiness_score(self, student: KindergartenStudent, subject: str, stats: Dict) -> int:
         """Calculate readiness score for a subject (0-100)."""
-        if subject not in student.progress:
+        if subject not in stats:
             return 0
         
-        data = student.progress[subject]
-        if data['attempts'] == 0:
+        success_rate, attempts, level, _ = stats[subject]
+        if attempts == 0:
             return 30  # Basic score for no attempts
         
-        success_rate = data['successes'] / data['attempts']
-        level_bonus = (data['level'] - 1) * 20  # Level progression bonus
+        level_bonus = (level - 1) * 20  # Level progression bonus
         engagement_bonus = 10 if success_rate > 0.7 else 0
         
         score = min(100, int(success_rate * 50 + level_bonus + engagement_bonus + 30))
@@ -215,7 +270,7 @@ class KindergartenAssessment:
         if len(student.sessions) == 0:
             return "No session data"
         
-        total_activities = sum(len(session.get('activities', [])) for session in student.sessions)
+        total_activities = student.total_activities
         avg_activities = total_activities / len(student.sessions)
         
         if avg_activities >= 8:
@@ -227,46 +282,32 @@ class KindergartenAssessment:
         else:
             return "Low activity engagement"
     
-    def _identify_preferred_subjects(self, student: KindergartenStudent) -> List[str]:
+    def _identify_preferred_subjects(self, student: KindergartenStudent, stats: Dict) -> List[str]:
         """Identify student's preferred subjects based on engagement."""
         subject_scores = {}
         
-        for subject, data in student.progress.items():
-            if data['attempts'] > 0:
-                success_rate = data['successes'] / data['attempts']
-                engagement_score = success_rate * data['attempts']  # Weight by activity
+        for subject, (success_rate, attempts, _, _) in stats.items():
+            if attempts > 0:
+                engagement_score = success_rate * attempts  # Weight by activity
                 subject_scores[subject] = engagement_score
         
         if not subject_scores:
             return ["Insufficient data to determine preferences"]
         
-        # Sort by engagement score
-        sorted_subjects = sorted(subject_scores.items(), key=lambda x: x[1], reverse=True)
-        return [subject for subject, score in sorted_subjects[:2]]  # Top 2 subjects
+        # Top 2 subjects by engagement score
+        return [subject for subject, score in nlargest(2, subject_scores.items(), key=itemgetter(1))]
     
     def _determine_mastery_status(self, success_rate: float, attempts: int) -> str:
         """Determine mastery status for a subject."""
         if attempts < 3:
             return "Insufficient attempts"
-        elif success_rate >= 0.9:
-            return "Mastered"
-        elif success_rate >= 0.7:
-            return "Proficient"
-        elif success_rate >= 0.5:
-            return "Developing"
-        else:
-            return "Needs support"
+        return MASTERY_LABELS[bisect_right(MASTERY_THRESHOLDS, success_rate)]
     
     def _assess_level_readiness(self, success_rate: float, attempts: int) -> str:
         """Assess readiness to advance to next level."""
         if attempts < 5:
             return "Need more practice at current level"
-        elif success_rate >= 0.85:
-            return "Ready to advance"
-        elif success_rate >= 0.7:
-            return "Nearly ready to advance"
-        else:
-            return "Continue at current level"
+        return LEVEL_READINESS_LABELS[bisect_right(LEVEL_READINESS_THRESHOLDS, success_rate)]
     
     def generate_progress_report(self, student_name: str) -> str:
         """Generate a formatted progress report."""
@@ -275,7 +316,7 @@ class KindergartenAssessment:
         if "error" in assessment:
             return assessment["error"]
         
-        report = f"""
+        parts = [f"""
 KINDERGARTEN LEARNING PROGRESS REPORT
 ====================================
 
@@ -291,17 +332,17 @@ Engagement Pattern: {assessment['learning_profile']['engagement_pattern']}
 Preferred Subjects: {', '.join(assessment['learning_profile']['preferred_subjects'])}
 
 ACADEMIC PROGRESS
-----------------"""
+----------------"""]
         
-        for subject, progress in assessment['academic_progress'].items():
-            report += f"""
+        parts.extend(f"""
 {subject.upper()}:
   Current Level: {progress['current_level']} - {progress['skill_description']}
   Mastery Status: {progress['mastery_status']}
   Success Rate: {progress['success_rate']} ({progress['attempts']} attempts)
   Next Level: {progress['next_level_readiness']}"""
+                     for subject, progress in assessment['academic_progress'].items())
         
-        report += f"""
+        parts.append(f"""
 
 ENGAGEMENT ANALYSIS
 ------------------
@@ -317,12 +358,11 @@ Math Skills: {assessment['readiness_indicators']['mathematical_thinking']['ready
 Reading Skills: {assessment['readiness_indicators']['reading_readiness']['ready_for']}
 
 RECOMMENDATIONS
---------------"""
+--------------""")
         
-        for i, rec in enumerate(assessment['recommendations'], 1):
-            report += f"\n{i}. {rec}"
+        parts.extend(f"\n{i}. {rec}" for i, rec in enumerate(assessment['recommendations'], 1))
         
-        return report
+        return "".join(parts)
 
 # Example usage and demonstration
 if __name__ == "__main__":
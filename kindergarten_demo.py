@@ -5,16 +5,57 @@ Teacher1 Kindergarten Demo
 Demonstrates the individualized kindergarten learning features.
 """
 
+import os
+import sys
 import time
 import json
-from personalized_chatbot import PersonalizedKindergartenChatbot
-from student_profile import StudentProfileManager
+
+# Set TEACHER1_FAST=1 to skip the pacing delays (e.g. for automated runs)
+FAST_MODE = os.environ.get('TEACHER1_FAST', '').lower() in ('1', 'true', 'yes')
+
+BAR = "=" * 60
+SEPARATOR = "-" * 60
+
+FEATURES_SHOWCASE = """\
+✅ Individual student profiles with persistent data
+✅ Adaptive difficulty based on performance
+✅ Learning style detection (visual, auditory, kinesthetic)
+✅ Progress tracking across subjects (math, reading, spelling, numbers)
+✅ Emotional state monitoring and appropriate responses
+✅ Personalized encouragement based on student needs
+✅ Session management with automatic progress saving
+✅ Kindergarten-appropriate content and interactions
+✅ Age-appropriate attention span management
+✅ Multi-modal learning activity suggestions"""
+
+IMPROVEMENTS_SUMMARY = """\
+🎯 PERSONALIZATION:
+   • Each student gets their own learning profile
+   • System remembers progress across sessions
+   • Adaptive difficulty prevents frustration and boredom
+   • Learning style detection optimizes teaching approach
+
+🎯 ASSESSMENT & PROGRESS:
+   • Real-time progress tracking for each subject
+   • Success rate monitoring for difficulty adjustment
+   • Engagement and emotional state tracking
+   • Detailed session history for teacher/parent review
+
+🎯 KINDERGARTEN-SPECIFIC:
+   • Age-appropriate interaction patterns
+   • Attention span awareness and break suggestions
+   • Positive reinforcement and encouragement system
+   • Multi-sensory learning activity recommendations
+   • Simple, clear feedback appropriate for 5-year-olds"""
+
+def pause(seconds):
+    """Pause between demo steps, unless running in fast mode."""
+    if not FAST_MODE:
+        time.sleep(seconds)
 
 def print_header(title):
     """Print a formatted header."""
-    print("\n" + "="*60)
-    print(f"  {title}")
-    print("="*60)
+    print(f"\n{BAR}\n  {title}\n{BAR}")
 
 def print_section(title):
     """Print a formatted section header."""
@@ -46,30 +87,37 @@ def simulate_student_interaction(chatbot, student_name, interactions):
                 print("   💪 Extra encouragement provided")
         
         # Small delay to simulate real interaction
-        time.sleep(0.5)
+        pause(0.5)
     
     # End session
     goodbye = chatbot.end_session()
     print(f"\n🎓 Teacher1: {goodbye}")
     
-    # Show progress summary
+    # Show progress summary, written out in one go
     summary = chatbot.get_student_progress_summary()
-    print_section(f"Progress Summary for {student_name}")
-    print(f"Learning Style: {summary.get('learning_style', 'Not determined yet')}")
-    print(f"Total Sessions: {summary.get('total_sessions', 0)}")
-    print(f"Needs Encouragement: {'Yes' if summary.get('needs_encouragement') else 'No'}")
+    lines = [
+        f"\n--- Progress Summary for {student_name} ---",
+        f"Learning Style: {summary.get('learning_style', 'Not determined yet')}",
+        f"Total Sessions: {summary.get('total_sessions', 0)}",
+        f"Needs Encouragement: {'Yes' if summary.get('needs_encouragement') else 'No'}"
+    ]
     
     if summary.get('progress'):
-        print("\nSubject Progress:")
+        lines.append("\nSubject Progress:")
         for subject, data in summary['progress'].items():
             if data['attempts'] > 0:
                 success_rate = (data['successes'] / data['attempts']) * 100
-                print(f"  {subject.title()}: Level {data['level']} - {success_rate:.0f}% success rate")
+                lines.append(f"  {subject.title()}: Level {data['level']} - {success_rate:.0f}% success rate")
             else:
-                print(f"  {subject.title()}: Level {data['level']} - No attempts yet")
+                lines.append(f"  {subject.title()}: Level {data['level']} - No attempts yet")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     """Main demo function."""
+    from personalized_chatbot import PersonalizedKindergartenChatbot
+    from student_profile import StudentProfileManager
+    
     print_header("Teacher1 Kindergarten Individualized Learning Demo")
     print("This demo shows how Teacher1 adapts to individual kindergarten students")
     
@@ -126,62 +174,32 @@ def main():
             scenario["name"], 
             scenario["interactions"]
         )
-        print("\n" + "-"*60)
-        time.sleep(1)  # Pause between students
+        print("\n" + SEPARATOR)
+        pause(1)  # Pause between students
     
     # Show all student profiles
     print_header("Student Profile Summary")
     
     manager = StudentProfileManager()
-    students = manager.list_students()
-    
-    for student_info in students:
-        student = manager.load_student(student_info["student_id"])
-        if student:
-            print_section(f"Profile: {student.name}")
-            print(f"Age: {student.age}")
-            print(f"Sessions: {len(student.sessions)}")
-            print(f"Preferred Learning Style: {student.get_preferred_learning_style()}")
-            
-            total_activities = sum(len(session.get('activities', [])) for session in student.sessions)
-            print(f"Total Learning Activities: {total_activities}")
-            
-            if student.is_frustrated():
-                print("⚠️  Student may need extra encouragement")
-            else:
-                print("😊 Student engagement is good")
+    
+    for student in manager.load_all_students():
+        print_section(f"Profile: {student.name}")
+        print(f"Age: {student.age}")
+        print(f"Sessions: {len(student.sessions)}")
+        print(f"Preferred Learning Style: {student.get_preferred_learning_style()}")
+        
+        print(f"Total Learning Activities: {student.total_activities}")
+        
+        if student.is_frustrated():
+            print("⚠️  Student may need extra encouragement")
+        else:
+            print("😊 Student engagement is good")
     
     print_header("Demo Features Showcase")
-    print("✅ Individual student profiles with persistent data")
-    print("✅ Adaptive difficulty based on performance")
-    print("✅ Learning style detection (visual, auditory, kinesthetic)")
-    print("✅ Progress tracking across subjects (math, reading, spelling, numbers)")
-    print("✅ Emotional state monitoring and appropriate responses")
-    print("✅ Personalized encouragement based on student needs")
-    print("✅ Session management with automatic progress saving")
-    print("✅ Kindergarten-appropriate content and interactions")
-    print("✅ Age-appropriate attention span management")
-    print("✅ Multi-modal learning activity suggestions")
+    print(FEATURES_SHOWCASE)
     
     print_header("Improvements for Individual Kindergarten Teaching")
-    print("🎯 PERSONALIZATION:")
-    print("   • Each student gets their own learning profile")
-    print("   • System remembers progress across sessions")
-    print("   • Adaptive difficulty prevents frustration and boredom")
-    print("   • Learning style detection optimizes teaching approach")
-    
-    print("\n🎯 ASSESSMENT & PROGRESS:")
-    print("   • Real-time progress tracking for each subject")
-    print("   • Success rate monitoring for difficulty adjustment")
-    print("   • Engagement and emotional state tracking")
-    print("   • Detailed session history for teacher/parent review")
-    
-    print("\n🎯 KINDERGARTEN-SPECIFIC:")
-    print("   • Age-appropriate interaction patterns")
-    print("   • Attention span awareness and break suggestions")
-    print("   • Positive reinforcement and encouragement system")
-    print("   • Multi-sensory learning activity recommendations")
-    print("   • Simple, clear feedback appropriate for 5-year-olds")
+    print(IMPROVEMENTS_SUMMARY)
     
     print(f"\nDemo completed! Check the 'student_profiles' directory for saved data.")
 
@@ -6,14 +6,43 @@ This module provides comprehensive management of optional dependencies,
 including fallback mechanisms, installation guidance, and feature detection.
 """
 
+import os
 import sys
+import io
+import json
+import shutil
 import subprocess
 import importlib
-from typing import Dict, List, Tuple, Optional
+import importlib.util
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional, TextIO
+
+# Imports each module named on the command line and reports one JSON line per module as soon as
+# it is done, so results for earlier modules survive a later one crashing the interpreter
+_SUBPROCESS_PROBE_SCRIPT = """
+import json, sys
+for name in sys.argv[1:]:
+    try:
+        module = __import__(name)
+        print(json.dumps([name, True, str(getattr(module, "__version__", "unknown"))]), flush=True)
+    except Exception as e:
+        print(json.dumps([name, False, f"{type(e).__name__}: {e}"]), flush=True)
+"""
 
 class OptionalDependencyManager:
     """Manages optional dependencies for enhanced Teacher1 functionality."""
     
+    # Seconds a dependency check result is reused before probing again
+    STATUS_CACHE_TTL = 60.0
+    
+    # Status of the last full scan, reused by later runs until the environment changes
+    DISK_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'teacher1', 'deps.json')
+    
+    # Modules known to cause import issues (bus errors, long hangs); only imported in a child process
+    SUBPROCESS_PROBE_MODULES = ('transformers', 'torch')
+    
     def __init__(self):
         # Optional Dependencies Configuration: Define all optional packages with fallback mechanisms
         # Network-resilient: Each dependency has a clear fallback to ensure functionality
@@ -71,8 +100,144 @@ class OptionalDependencyManager:
                 'fallback': 'Text-only TTS output',
                 'install_cmd': None,
                 'system_cmd': 'sudo apt-get install espeak espeak-data'
+            },
+            'orjson': {
+                'pip_package': 'orjson',
+                'description': 'Fast JSON reading/writing for student profiles',
+                'category': 'performance',
+                'system_deps': [],
+                'fallback': 'Standard library json for student profiles',
+                'install_cmd': 'pip install orjson',
+                'system_cmd': None
+            },
+            'uvloop': {
+                'pip_package': 'uvloop',
+                'description': 'Fast event loop for the WebSocket services (Fractal AI thread, BlenderBot chatbot)',
+                'category': 'performance',
+                'system_deps': [],
+                'fallback': 'Standard asyncio event loop',
+                'install_cmd': 'pip install uvloop',
+                'system_cmd': None
             }
         }
+        
+        # Dependency names grouped by category, in spec order, for reports
+        self._by_category: Dict[str, List[str]] = {}
+        for dep_name, spec in self.dependency_specs.items():
+            self._by_category.setdefault(spec['category'], []).append(dep_name)
+        
+        # Status caches: the full status map, and dep_name -> (checked_at, result)
+        self._status_cache = None
+        self._status_cache_ts = 0.0
+        self._dep_status_cache = {}
+        self._subprocess_probe = None  # (checked_at, results) from _probe_in_subprocess
+        self._subprocess_probe_lock = threading.Lock()
+    
+    def invalidate_cache(self):
+        """Forget cached dependency status, e.g. after installing packages."""
+        self._status_cache = None
+        self._status_cache_ts = 0.0
+        self._dep_status_cache = {}
+        self._subprocess_probe = None
+        try:
+            os.remove(self.DISK_CACHE_PATH)
+        except OSError:
+            pass
+    
+    def _environment_key(self) -> Dict:
+        """Describe what the probe results depend on, for validating the disk cache.
+        
+        Installing a Python package changes the mtime of its site-packages directory and
+        installing a system package changes that of a PATH directory, so the newest mtime
+        across sys.path and PATH entries moves whenever a result could have changed.
+        """
+        search_dirs = [entry or os.getcwd() for entry in sys.path]
+        search_dirs.extend(os.environ.get('PATH', '').split(os.pathsep))
+        newest = 0.0
+        for directory in search_dirs:
+            try:
+                newest = max(newest, os.stat(directory).st_mtime)
+            except OSError:
+                continue
+        return {'executable': sys.executable, 'sys_path': sys.path, 'newest_mtime': newest}
+    
+    def _load_disk_cache(self) -> Optional[Dict]:
+        """Return the status map saved by an earlier run, if it is still valid."""
+        try:
+            with open(self.DISK_CACHE_PATH, 'r') as f:
+                cached = json.load(f)
+            if cached['environment'] != self._environment_key():
+                return None
+            results = cached['status']
+            if results.keys() != self.dependency_specs.keys():
+                return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        
+        for dep_name, dep_status in results.items():
+            dep_status['spec'] = self.dependency_specs[dep_name]
+        return results
+    
+    def _save_disk_cache(self, results: Dict):
+        """Save a status map for later runs; failing to write it is not an error."""
+        status = {dep_name: {key: value for key, value in dep_status.items() if key != 'spec'}
+                  for dep_name, dep_status in results.items()}
+        try:
+            os.makedirs(os.path.dirname(self.DISK_CACHE_PATH), exist_ok=True)
+            with open(self.DISK_CACHE_PATH, 'w') as f:
+                json.dump({'environment': self._environment_key(), 'status': status}, f, indent=2)
+        except (OSError, TypeError, ValueError):
+            pass
+    
+    def _probe_in_subprocess(self) -> Dict[str, Tuple[bool, str]]:
+        """Import all SUBPROCESS_PROBE_MODULES in a single child interpreter.
+        
+        Returns module -> (available, version or error message).
+        """
+        with self._subprocess_probe_lock:
+            cached = self._subprocess_probe
+            if cached and time.monotonic() - cached[0] < self.STATUS_CACHE_TTL:
+                return cached[1]
+            
+            # Modules that aren't installed at all don't need a child interpreter to tell
+            results = {}
+            installed = []
+            for name in self.SUBPROCESS_PROBE_MODULES:
+                if importlib.util.find_spec(name) is None:
+                    results[name] = (False, f"Module import failed: ModuleNotFoundError: No module named '{name}'")
+                else:
+                    installed.append(name)
+            
+            timed_out = False
+            output, errors = '', ''
+            if installed:
+                try:
+                    probe = subprocess.run([sys.executable, '-c', _SUBPROCESS_PROBE_SCRIPT, *installed],
+                                           capture_output=True, text=True, timeout=30)
+                    output, errors = probe.stdout, probe.stderr or f'probe exited with code {probe.returncode}'
+                except subprocess.TimeoutExpired as e:
+                    timed_out = True
+                    output = e.stdout or ''
+                if isinstance(output, bytes):  # Partial output from a timed-out child may not be decoded
+                    output = output.decode(errors='replace')
+            
+            for line in output.splitlines():
+                try:
+                    name, available, detail = json.loads(line)
+                except ValueError:
+                    continue
+                results[name] = (available, detail if available else f'Module import failed: {detail}')
+            
+            # Anything unreported hung or crashed the child before it could print
+            for name in self.SUBPROCESS_PROBE_MODULES:
+                if name not in results:
+                    if timed_out:
+                        results[name] = (False, f'{name} import check timed out (likely compatibility issue)')
+                    else:
+                        results[name] = (False, f'Module import failed: {errors.strip()}')
+            
+            self._subprocess_probe = (time.monotonic(), results)
+            return results
     
     def check_dependency_status(self, dep_name: str) -> Dict:
         """Check if a specific dependency is available.
@@ -83,6 +248,10 @@ class OptionalDependencyManager:
         if not spec:
             return {'available': False, 'error': 'Unknown dependency'}
         
+        cached = self._dep_status_cache.get(dep_name)
+        if cached and time.monotonic() - cached[0] < self.STATUS_CACHE_TTL:
+            return cached[1]
+        
         result = {
             'name': dep_name,
             'available': False,
@@ -94,14 +263,13 @@ class OptionalDependencyManager:
         
         try:
             if dep_name == 'espeak':
-                # Network-resilient: Check system command with timeout
+                # Network-resilient: Look up the system command in-process, only run it with a timeout
                 try:
-                    cmd_result = subprocess.run(['which', 'espeak'], 
-                                              capture_output=True, text=True, timeout=10)
-                    result['available'] = cmd_result.returncode == 0
+                    espeak_path = shutil.which('espeak')
+                    result['available'] = espeak_path is not None
                     if result['available']:
                         # Get espeak version with timeout
-                        version_result = subprocess.run(['espeak', '--version'], 
+                        version_result = subprocess.run([espeak_path, '--version'], 
                                                       capture_output=True, text=True, timeout=10)
                         if version_result.returncode == 0:
                             result['version'] = version_result.stdout.strip().split('\n')[0]
@@ -115,20 +283,20 @@ class OptionalDependencyManager:
                 # Network-resilient: Check Python module with safe import and known problematic modules
                 try:
                     # Special handling for modules known to cause import issues
-                    if dep_name in ['transformers', 'torch']:
+                    if dep_name in self.SUBPROCESS_PROBE_MODULES:
                         # Network-resilient: Use safer subprocess-based checking for problematic modules
-                        import sys
-                        check_result = subprocess.run([
-                            sys.executable, '-c', f'import {dep_name}; print(getattr({dep_name}, "__version__", "unknown"))'
-                        ], capture_output=True, text=True, timeout=15)
-                        
-                        if check_result.returncode == 0:
+                        available, detail = self._probe_in_subprocess()[dep_name]
+                        if available:
                             result['available'] = True
-                            result['version'] = check_result.stdout.strip()
+                            result['version'] = detail
                         else:
-                            result['error'] = f'Module import failed: {check_result.stderr.strip()}'
+                            result['error'] = detail
+                    elif importlib.util.find_spec(dep_name) is None:
+                        # Not installed: the finder lookup answers this without running any module code
+                        result['error'] = f"No module named '{dep_name}'"
                     else:
-                        # Standard import for stable modules
+                        # Standard import for stable modules; a spec alone doesn't prove it loads
+                        # (e.g. pyaudio without the PortAudio library)
                         module = importlib.import_module(dep_name)
                         result['available'] = True
                         result['version'] = getattr(module, '__version__', 'unknown')
@@ -143,18 +311,36 @@ class OptionalDependencyManager:
             # Network-resilient: Catch any unexpected errors
             result['error'] = f'Dependency check failed: {str(e)}'
         
+        self._dep_status_cache[dep_name] = (time.monotonic(), result)
         return result
     
     def get_all_dependencies_status(self) -> Dict:
         """Get status of all optional dependencies.
         
         Network-resilient: Safe checking with individual error handling.
+        Results are cached for STATUS_CACHE_TTL seconds, and on disk (DISK_CACHE_PATH) until
+        packages are installed or removed; see invalidate_cache().
         """
+        if self._status_cache and time.monotonic() - self._status_cache_ts < self.STATUS_CACHE_TTL:
+            return self._status_cache
+        
+        if self._status_cache is None:
+            results = self._load_disk_cache()
+            if results is not None:
+                self._status_cache = results
+                self._status_cache_ts = time.monotonic()
+                return results
+        
+        # Probes are independent and mostly wait on subprocesses, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(self.dependency_specs)) as executor:
+            futures = {dep_name: executor.submit(self.check_dependency_status, dep_name)
+                       for dep_name in self.dependency_specs}
+        
         results = {}
-        for dep_name in self.dependency_specs.keys():
+        for dep_name, future in futures.items():
             try:
                 # Network-resilient: Check each dependency individually with error isolation
-                results[dep_name] = self.check_dependency_status(dep_name)
+                results[dep_name] = future.result()
             except Exception as e:
                 # Network-resilient: Isolate errors to prevent cascading failures
                 results[dep_name] = {
@@ -165,6 +351,10 @@ class OptionalDependencyManager:
                     'fallback_available': True,
                     'spec': self.dependency_specs.get(dep_name, {})
                 }
+        
+        self._status_cache = results
+        self._status_cache_ts = time.monotonic()
+        self._save_disk_cache(results)
         return results
     
     def get_summary_stats(self) -> Tuple[int, int, float]:
@@ -183,79 +373,70 @@ class OptionalDependencyManager:
         status = self.get_all_dependencies_status()
         working, total, percentage = self.get_summary_stats()
         
-        print(f"\n📊 Summary: {working}/{total} ({percentage:.0f}%) dependencies available")
+        # Collect the report and write it out in one go
+        lines = [f"\n📊 Summary: {working}/{total} ({percentage:.0f}%) dependencies available"]
         
-        # Group by category
-        categories = {}
-        for dep_name, dep_status in status.items():
-            category = dep_status['spec']['category']
-            if category not in categories:
-                categories[category] = []
-            categories[category].append((dep_name, dep_status))
-        
-        for category, deps in categories.items():
+        for category, dep_names in self._by_category.items():
+            deps = [(dep_name, status[dep_name]) for dep_name in dep_names]
             category_working = sum(1 for _, dep in deps if dep['available'])
             category_total = len(deps)
             category_percentage = (category_working / category_total) * 100
             
-            print(f"\n🔧 {category.upper()} Dependencies: {category_working}/{category_total} ({category_percentage:.0f}%)")
+            lines.append(f"\n🔧 {category.upper()} Dependencies: {category_working}/{category_total} ({category_percentage:.0f}%)")
             
             for dep_name, dep_status in deps:
+                spec = dep_status['spec']
                 status_icon = "✅" if dep_status['available'] else "❌"
                 version_str = f" ({dep_status['version']})" if dep_status['version'] else ""
-                print(f"  {status_icon} {dep_name}{version_str}")
-                print(f"      {dep_status['spec']['description']}")
+                lines.append(f"  {status_icon} {dep_name}{version_str}")
+                lines.append(f"      {spec['description']}")
                 
                 if not dep_status['available']:
-                    print(f"      🔄 Fallback: {dep_status['spec']['fallback']}")
-                    if dep_status['spec']['system_cmd']:
-                        print(f"      📦 System: {dep_status['spec']['system_cmd']}")
-                    if dep_status['spec']['install_cmd']:
-                        print(f"      🐍 Python: {dep_status['spec']['install_cmd']}")
+                    lines.append(f"      🔄 Fallback: {spec['fallback']}")
+                    system_cmd = spec['system_cmd']
+                    if system_cmd:
+                        lines.append(f"      📦 System: {system_cmd}")
+                    install_cmd = spec['install_cmd']
+                    if install_cmd:
+                        lines.append(f"      🐍 Python: {install_cmd}")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def generate_installation_script(self) -> str:
         """Generate a bash script to install missing dependencies."""
+        buffer = io.StringIO()
+        self.write_installation_script(buffer)
+        return buffer.getvalue()
+    
+    def write_installation_script(self, out: TextIO):
+        """Write a bash script that installs missing dependencies to a file-like object."""
         status = self.get_all_dependencies_status()
-        script_lines = [
-            "#!/bin/bash",
-            "# Auto-generated installation script for Teacher1 optional dependencies",
-            "echo '🎯 Installing Teacher1 Optional Dependencies'",
-            ""
-        ]
+        out.write("#!/bin/bash\n"
+                  "# Auto-generated installation script for Teacher1 optional dependencies\n"
+                  "echo '🎯 Installing Teacher1 Optional Dependencies'\n"
+                  "\n")
+        
+        missing = [dep_status['spec'] for dep_status in status.values() if not dep_status['available']]
         
         # System packages first
-        system_packages = set()
-        for dep_status in status.values():
-            if not dep_status['available'] and dep_status['spec']['system_deps']:
-                system_packages.update(dep_status['spec']['system_deps'])
+        system_packages = {package for spec in missing for package in spec['system_deps']}
         
         if system_packages:
-            script_lines.extend([
-                "echo '📦 Installing system packages...'",
-                f"sudo apt-get update",
-                f"sudo apt-get install -y {' '.join(sorted(system_packages))}",
-                ""
-            ])
+            out.write("echo '📦 Installing system packages...'\n"
+                      "sudo apt-get update\n"
+                      f"sudo apt-get install -y {' '.join(sorted(system_packages))}\n"
+                      "\n")
         
         # Python packages
-        pip_packages = []
-        for dep_name, dep_status in status.items():
-            if not dep_status['available'] and dep_status['spec']['pip_package']:
-                pip_packages.append(dep_status['spec']['pip_package'])
+        pip_packages = [spec['pip_package'] for spec in missing if spec['pip_package']]
         
         if pip_packages:
-            script_lines.extend([
-                "echo '🐍 Installing Python packages...'",
-                f"pip install {' '.join(pip_packages)}",
-                ""
-            ])
-        
-        script_lines.extend([
-            "echo '✅ Installation complete!'",
-            "echo 'Run python -c \"from optional_dependencies_manager import OptionalDependencyManager; OptionalDependencyManager().print_detailed_report()\" to verify'"
-        ])
+            out.write("echo '🐍 Installing Python packages...'\n"
+                      f"pip install {' '.join(pip_packages)}\n"
+                      "\n")
         
-        return '\n'.join(script_lines)
+        out.write("echo '✅ Installation complete!'\n"
+                  "echo 'Run python -c \"from optional_dependencies_manager import OptionalDependencyManager; OptionalDependencyManager().print_detailed_report()\" to verify'")
 
 
 def main():
@@ -263,9 +444,8 @@ def main():
     manager = OptionalDependencyManager()
     
     if len(sys.argv) > 1 and sys.argv[1] == '--generate-script':
-        script = manager.generate_installation_script()
         with open('install_optional_dependencies.sh', 'w') as f:
-            f.write(script)
+            manager.write_installation_script(f)
         print("✅ Generated install_optional_dependencies.sh")
     else:
         manager.print_detailed_report()
@@ -5,10 +5,13 @@ Enhanced chatbot integration with student profiling and adaptive learning.
 """
 
 import os
+import re
 import sys
+import atexit
 import random
 import time
-from typing import Optional, Dict, List, Tuple
+import weakref
+from typing import Optional, Dict, List, NamedTuple, Tuple
 from datetime import datetime
 
 # Add the project root to Python path
@@ -17,6 +20,221 @@ sys.path.insert(0, project_root)
 
 from student_profile import KindergartenStudent, StudentProfileManager
 
+# Intent keywords in priority order: the first intent with one of its keywords
+# among the input's words (or one of its phrases in the input) wins.
+INTENT_KEYWORDS = (
+    (("hi", "hello", "hey", "good morning"), "greeting", None),
+    (("help", "don't know", "confused", "stuck"), "help", None),
+    (("math", "numbers", "count", "add", "plus"), "lesson_request", "math"),
+    (("read", "reading", "letter", "word", "words", "sound", "sounds", "phonics"), "lesson_request", "reading"),
+    (("spell", "spelling", "letters"), "lesson_request", "spelling"),
+    (("number", "counting"), "lesson_request", "numbers"),
+    (("hard", "difficult", "can't", "don't want", "boring"), "encouragement_needed", None),
+)
+INTENT_MATCHERS = tuple(
+    (frozenset(k for k in keywords if " " not in k), tuple(k for k in keywords if " " in k), intent, subject)
+    for keywords, intent, subject in INTENT_KEYWORDS
+)
+WORD_RE = re.compile(r"[a-z']+")
+INTENT_WORDS = frozenset().union(*(keywords for keywords, _, _, _ in INTENT_MATCHERS))
+
+# Replies this short to a pending question ("5", "b") skip intent analysis
+SHORT_ANSWER_LENGTH = 2
+
+# Progress is written to disk every SAVE_EVERY_ACTIVITIES answers, or on the
+# first answer more than SAVE_INTERVAL seconds after the last save (there is no
+# timer). It is always written when a session ends or is replaced by
+# start_session, and at interpreter exit for sessions that were never ended.
+SAVE_EVERY_ACTIVITIES = 5
+SAVE_INTERVAL = 10.0
+
+# Chatbots that may hold unsaved progress, flushed by _save_all_progress at exit
+_LIVE_CHATBOTS = weakref.WeakSet()
+
+
+def _save_all_progress():
+    """Write buffered progress for every live chatbot (registered with atexit)."""
+    for chatbot in list(_LIVE_CHATBOTS):
+        chatbot.save_progress()
+
+
+atexit.register(_save_all_progress)
+
+
+class ContentRecord(NamedTuple):
+    """Questions, expected answers and activity types for one subject level."""
+    questions: Tuple[str, ...]
+    answers: Tuple[str, ...]
+    activities: Tuple[str, ...]
+
+
+# Kindergarten educational content keyed by (subject, difficulty)
+EDUCATIONAL_CONTENT = {
+    ("math", 1): ContentRecord(  # Beginner
+        questions=(
+            "What comes after 3?",
+            "Count with me: 1, 2, 3, ?",
+            "If you have 2 apples and I give you 1 more, how many do you have?",
+            "Show me 5 fingers!"
+        ),
+        answers=("4", "4", "3", "5"),
+        activities=("counting", "simple_addition", "number_recognition")
+    ),
+    ("math", 2): ContentRecord(  # Easy
+        questions=(
+            "What is 2 + 2?",
+            "Count backwards from 5: 5, 4, 3, ?",
+            "Which is bigger: 6 or 3?",
+            "If you have 5 toys and give away 2, how many are left?"
+        ),
+        answers=("4", "2", "6", "3"),
+        activities=("addition", "subtraction", "comparison")
+    ),
+    ("math", 3): ContentRecord(  # Medium
+        questions=(
+            "What is 5 + 3?",
+            "What is 10 - 4?",
+            "How many sides does a triangle have?",
+            "What number is between 7 and 9?"
+        ),
+        answers=("8", "6", "3", "8"),
+        activities=("addition", "subtraction", "shapes", "number_patterns")
+    ),
+    ("reading", 1): ContentRecord(  # Beginner
+        questions=(
+            "What sound does the letter 'A' make?",
+            "Can you find the letter 'B' in the word 'BIG'?",
+            "What letter does 'CAT' start with?",
+            "Point to the letter 'M' in 'MOM'"
+        ),
+        answers=("a", "b", "c", "m"),
+        activities=("letter_recognition", "phonics", "letter_sounds")
+    ),
+    ("reading", 2): ContentRecord(  # Easy
+        questions=(
+            "What word rhymes with 'CAT'?",
+            "How many letters are in 'DOG'?",
+            "What sound do you hear at the beginning of 'SUN'?",
+            "Can you read this word: 'THE'?"
+        ),
+        answers=("bat", "3", "s", "the"),
+        activities=("rhyming", "word_length", "beginning_sounds", "sight_words")
+    ),
+    ("reading", 3): ContentRecord(  # Medium
+        questions=(
+            "What is the opposite of 'BIG'?",
+            "Can you make a sentence with the word 'HAPPY'?",
+            "What sound do you hear in the middle of 'CAT'?",
+            "How many words are in 'I like dogs'?"
+        ),
+        answers=("small", "varies", "a", "3"),
+        activities=("opposites", "sentence_building", "middle_sounds", "word_counting")
+    ),
+    ("spelling", 1): ContentRecord(  # Beginner
+        questions=(
+            "Can you spell 'CAT'?",
+            "What letters make 'DOG'?",
+            "Spell your name for me!",
+            "How do you spell 'MOM'?"
+        ),
+        answers=("cat", "dog", "varies", "mom"),
+        activities=("simple_spelling", "name_spelling", "family_words")
+    ),
+    ("spelling", 2): ContentRecord(  # Easy
+        questions=(
+            "Can you spell 'FISH'?",
+            "How do you spell 'BOOK'?",
+            "Spell the word for a small furry pet: 'CAT'",
+            "Can you spell 'HAPPY'?"
+        ),
+        answers=("fish", "book", "cat", "happy"),
+        activities=("word_spelling", "themed_spelling", "emotion_words")
+    ),
+    ("numbers", 1): ContentRecord(  # Beginner
+        questions=(
+            "Can you count to 5?",
+            "What number comes before 3?",
+            "Show me the number 7!",
+            "Count these dots: • • •"
+        ),
+        answers=("1,2,3,4,5", "2", "7", "3"),
+        activities=("counting", "number_order", "number_recognition", "dot_counting")
+    ),
+    ("numbers", 2): ContentRecord(  # Easy
+        questions=(
+            "Can you count to 10?",
+            "What number is missing: 1, 2, _, 4?",
+            "Which is smaller: 8 or 5?",
+            "Count by 2s: 2, 4, 6, _?"
+        ),
+        answers=("1,2,3,4,5,6,7,8,9,10", "3", "5", "8"),
+        activities=("counting_to_ten", "missing_numbers", "number_comparison", "skip_counting")
+    )
+}
+CONTENT_SUBJECTS = frozenset(subject for subject, _ in EDUCATIONAL_CONTENT)
+
+# Response pools
+ENCOURAGEMENT_RESPONSES = {
+    "high": (
+        "You're doing great! Let's try something a little different.",
+        "I can see you're working hard! How about we take a fun break?",
+        "You're such a good learner! Let's try this together step by step.",
+        "Don't worry, learning takes time. You're doing wonderfully!"
+    ),
+    "moderate": (
+        "Nice work! You're getting better at this!",
+        "Great job! Let's keep going!",
+        "You're learning so well! I'm proud of you!",
+        "Excellent! You're becoming an expert!"
+    ),
+    "maintain": (
+        "Fantastic! You're on fire today!",
+        "Wow! You're really good at this!",
+        "Amazing work! You're a superstar!",
+        "Incredible! You make this look easy!"
+    )
+}
+
+FAST_CORRECT_FEEDBACK = (
+    "Wow! You're so quick and smart!",
+    "Amazing! You got that super fast!",
+    "Fantastic! You're a {subject} superstar!"
+)
+
+# Feedback templates that need .format(subject=...)
+SUBJECT_TEMPLATES = frozenset(t for t in FAST_CORRECT_FEEDBACK if "{subject}" in t)
+
+SLOW_CORRECT_FEEDBACK = (
+    "Excellent work! You really thought about that!",
+    "Great job! I can see you're thinking carefully!",
+    "Perfect! Taking your time helped you get it right!"
+)
+
+TRY_AGAIN_FEEDBACK = (
+    "Good try! Let's work on this together!",
+    "That's okay! Learning takes practice!",
+    "Nice attempt! Let me help you with this!"
+)
+
+BREAK_SUGGESTIONS = (
+    "You've been working so hard! How about we take a little break? We can stretch or sing a song!",
+    "Great job learning today! Let's take a fun break and then come back to learning!",
+    "You're doing amazing! Want to take a quick break? We can play a movement game!"
+)
+
+HELP_RESPONSES = (
+    "I'm here to help you! What would you like to learn about? We can try math, reading, spelling, or numbers!",
+    "Of course I'll help! Tell me what you're curious about and we'll learn together!",
+    "I love helping! What sounds fun to you today - counting, letters, or maybe some math?"
+)
+
+ADAPTIVE_RESPONSES = (
+    "That's really interesting! Tell me more!",
+    "I love learning new things with you! What else are you thinking about?",
+    "You're so smart! What would you like to explore next?",
+    "That's a great thought! What would you like to learn about today?"
+)
+
 class PersonalizedKindergartenChatbot:
     """
     Personalized chatbot for kindergarten education with adaptive learning.
@@ -26,148 +244,30 @@ class PersonalizedKindergartenChatbot:
         self.student_manager = StudentProfileManager()
         self.current_student = None
         self.current_session_id = None
+        self._current_session = None  # Session dict for current_session_id
         self.session_start_time = None
+        self._session_start_monotonic = None  # For break timing
+        self._unsaved_changes = False
+        self._unsaved_activities = 0  # Answers recorded since the last save
+        self._last_save = time.monotonic()
+        self._current_question = {}  # subject -> last question asked
+        self._awaiting_answer_subject = None  # Subject of an unanswered question
+        self._greeting_cache = None  # ((session_id, activity count), greeting)
         
         # Educational content organized by subject and difficulty
-        self.educational_content = self._load_educational_content()
+        self.educational_content = EDUCATIONAL_CONTENT
         
         # Emotional responses based on student state
-        self.encouragement_responses = {
-            "high": [
-                "You're doing great! Let's try something a little different.",
-                "I can see you're working hard! How about we take a fun break?",
-                "You're such a good learner! Let's try this together step by step.",
-                "Don't worry, learning takes time. You're doing wonderfully!"
-            ],
-            "moderate": [
-                "Nice work! You're getting better at this!",
-                "Great job! Let's keep going!",
-                "You're learning so well! I'm proud of you!",
-                "Excellent! You're becoming an expert!"
-            ],
-            "maintain": [
-                "Fantastic! You're on fire today!",
-                "Wow! You're really good at this!",
-                "Amazing work! You're a superstar!",
-                "Incredible! You make this look easy!"
-            ]
-        }
-
-    def _load_educational_content(self) -> Dict:
-        """Load kindergarten educational content organized by difficulty."""
-        return {
-            "math": {
-                1: {  # Beginner
-                    "questions": [
-                        "What comes after 3?",
-                        "Count with me: 1, 2, 3, ?",
-                        "If you have 2 apples and I give you 1 more, how many do you have?",
-                        "Show me 5 fingers!"
-                    ],
-                    "answers": ["4", "4", "3", "5"],
-                    "activities": ["counting", "simple_addition", "number_recognition"]
-                },
-                2: {  # Easy
-                    "questions": [
-                        "What is 2 + 2?",
-                        "Count backwards from 5: 5, 4, 3, ?",
-                        "Which is bigger: 6 or 3?",
-                        "If you have 5 toys and give away 2, how many are left?"
-                    ],
-                    "answers": ["4", "2", "6", "3"],
-                    "activities": ["addition", "subtraction", "comparison"]
-                },
-                3: {  # Medium
-                    "questions": [
-                        "What is 5 + 3?",
-                        "What is 10 - 4?",
-                        "How many sides does a triangle have?",
-                        "What number is between 7 and 9?"
-                    ],
-                    "answers": ["8", "6", "3", "8"],
-                    "activities": ["addition", "subtraction", "shapes", "number_patterns"]
-                }
-            },
-            "reading": {
-                1: {  # Beginner
-                    "questions": [
-                        "What sound does the letter 'A' make?",
-                        "Can you find the letter 'B' in the word 'BIG'?",
-                        "What letter does 'CAT' start with?",
-                        "Point to the letter 'M' in 'MOM'"
-                    ],
-                    "answers": ["a", "b", "c", "m"],
-                    "activities": ["letter_recognition", "phonics", "letter_sounds"]
-                },
-                2: {  # Easy
-                    "questions": [
-                        "What word rhymes with 'CAT'?",
-                        "How many letters are in 'DOG'?",
-                        "What sound do you hear at the beginning of 'SUN'?",
-                        "Can you read this word: 'THE'?"
-                    ],
-                    "answers": ["bat", "3", "s", "the"],
-                    "activities": ["rhyming", "word_length", "beginning_sounds", "sight_words"]
-                },
-                3: {  # Medium
-                    "questions": [
-                        "What is the opposite of 'BIG'?",
-                        "Can you make a sentence with the word 'HAPPY'?",
-                        "What sound do you hear in the middle of 'CAT'?",
-                        "How many words are in 'I like dogs'?"
-                    ],
-                    "answers": ["small", "varies", "a", "3"],
-                    "activities": ["opposites", "sentence_building", "middle_sounds", "word_counting"]
-                }
-            },
-            "spelling": {
-                1: {  # Beginner
-                    "questions": [
-                        "Can you spell 'CAT'?",
-                        "What letters make 'DOG'?",
-                        "Spell your name for me!",
-                        "How do you spell 'MOM'?"
-                    ],
-                    "answers": ["cat", "dog", "varies", "mom"],
-                    "activities": ["simple_spelling", "name_spelling", "family_words"]
-                },
-                2: {  # Easy
-                    "questions": [
-                        "Can you spell 'FISH'?",
-                        "How do you spell 'BOOK'?",
-                        "Spell the word for a small furry pet: 'CAT'",
-                        "Can you spell 'HAPPY'?"
-                    ],
-                    "answers": ["fish", "book", "cat", "happy"],
-                    "activities": ["word_spelling", "themed_spelling", "emotion_words"]
-                }
-            },
-            "numbers": {
-                1: {  # Beginner
-                    "questions": [
-                        "Can you count to 5?",
-                        "What number comes before 3?",
-                        "Show me the number 7!",
-                        "Count these dots: • • •"
-                    ],
-                    "answers": ["1,2,3,4,5", "2", "7", "3"],
-                    "activities": ["counting", "number_order", "number_recognition", "dot_counting"]
-                },
-                2: {  # Easy
-                    "questions": [
-                        "Can you count to 10?",
-                        "What number is missing: 1, 2, _, 4?",
-                        "Which is smaller: 8 or 5?",
-                        "Count by 2s: 2, 4, 6, _?"
-                    ],
-                    "answers": ["1,2,3,4,5,6,7,8,9,10", "3", "5", "8"],
-                    "activities": ["counting_to_ten", "missing_numbers", "number_comparison", "skip_counting"]
-                }
-            }
-        }
+        self.encouragement_responses = ENCOURAGEMENT_RESPONSES
+        self._rand = random.Random()
+        self._response_queues = {}  # response pool -> iterator over a shuffled copy
+        _LIVE_CHATBOTS.add(self)
 
     def start_session(self, student_name: str) -> str:
         """Start a personalized learning session."""
+        # Don't lose buffered progress from a previous student
+        self.save_progress()
+        
         # Load or create student profile
         self.current_student = self.student_manager.get_student_by_name(student_name)
         if not self.current_student:
@@ -176,13 +276,23 @@ class PersonalizedKindergartenChatbot:
         
         # Start session
         self.current_session_id = self.current_student.start_session()
+        self._awaiting_answer_subject = None
+        self._current_session = self.current_student.get_session(self.current_session_id)
         self.session_start_time = datetime.now()
+        self._session_start_monotonic = time.monotonic()
         
         # Personalized greeting
         greeting = self._generate_personalized_greeting()
         return greeting
 
     def _generate_personalized_greeting(self) -> str:
+        """Generate a personalized greeting, reusing it while nothing has changed."""
+        key = (self.current_session_id, self.current_student.total_activities)
+        if self._greeting_cache is None or self._greeting_cache[0] != key:
+            self._greeting_cache = (key, self._build_personalized_greeting())
+        return self._greeting_cache[1]
+
+    def _build_personalized_greeting(self) -> str:
         """Generate a personalized greeting based on student profile."""
         name = self.current_student.name
         
@@ -208,26 +318,31 @@ class PersonalizedKindergartenChatbot:
             return "Hi! What's your name? I'd love to learn with you!", {}
         
         # Check if student needs a break
-        if self.current_student.needs_break(self.session_start_time):
+        if self.current_student.needs_break(self._session_start_monotonic):
             return self._suggest_break(), {"break_suggested": True}
         
+        # Short replies to a pending question are answers unless they are a keyword
+        stripped = user_input.strip()
+        if (self._awaiting_answer_subject and 0 < len(stripped) <= SHORT_ANSWER_LENGTH
+                and stripped.lower() not in INTENT_WORDS):
+            return self._process_answer(user_input, self._awaiting_answer_subject), {"answer_processed": True}
+        
         # Analyze input for learning intent
         intent, subject = self._analyze_input(user_input)
         
-        # Get appropriate difficulty level
-        difficulty = self.current_student.get_recommended_difficulty(subject) if subject else 1
-        
-        # Generate response based on intent
-        if intent == "greeting":
-            return self._generate_personalized_greeting(), {}
-        elif intent == "help":
-            return self._generate_help_response(), {}
+        # Generate response based on intent (most frequent intents first)
+        if intent == "answer":
+            return self._process_answer(user_input, subject), {"answer_processed": True}
         elif intent == "lesson_request":
+            # Get appropriate difficulty level
+            difficulty = self.current_student.get_recommended_difficulty(subject)
             return self._generate_lesson(subject, difficulty), {"lesson_started": True, "subject": subject}
-        elif intent == "answer":
-            return self._process_answer(user_input, subject), {"answer_processed": True}
+        elif intent == "help":
+            return self._generate_help_response(), {}
         elif intent == "encouragement_needed":
             return self._provide_encouragement(), {"encouragement_provided": True}
+        elif intent == "greeting":
+            return self._generate_personalized_greeting(), {}
         else:
             return self._generate_adaptive_response(user_input), {}
 
@@ -235,42 +350,20 @@ class PersonalizedKindergartenChatbot:
         """Analyze user input to determine intent and subject."""
         input_lower = user_input.lower()
         
-        # Greeting detection
-        if any(word in input_lower for word in ["hi", "hello", "hey", "good morning"]):
-            return "greeting", None
-        
-        # Help detection
-        if any(word in input_lower for word in ["help", "don't know", "confused", "stuck"]):
-            return "help", None
-        
-        # Subject detection
-        if any(word in input_lower for word in ["math", "numbers", "count", "add", "plus"]):
-            return "lesson_request", "math"
-        elif any(word in input_lower for word in ["read", "letter", "word", "sound", "phonics"]):
-            return "lesson_request", "reading"
-        elif any(word in input_lower for word in ["spell", "spelling", "letters"]):
-            return "lesson_request", "spelling"
-        elif any(word in input_lower for word in ["number", "counting"]):
-            return "lesson_request", "numbers"
-        
-        # Frustration indicators
-        if any(word in input_lower for word in ["hard", "difficult", "can't", "don't want", "boring"]):
-            return "encouragement_needed", None
+        words = set(WORD_RE.findall(input_lower))
+        for keywords, phrases, intent, subject in INTENT_MATCHERS:
+            if not keywords.isdisjoint(words) or any(phrase in input_lower for phrase in phrases):
+                return intent, subject
         
-        # Assume it's an answer to a question
-        return "answer", self._get_current_subject()
+        # Assume it's an answer to the pending question
+        return "answer", self._awaiting_answer_subject or self._get_current_subject()
 
     def _get_current_subject(self) -> Optional[str]:
         """Get the current subject being studied."""
         if not self.current_student or not self.current_session_id:
             return None
         
-        current_session = None
-        for session in self.current_student.sessions:
-            if session["session_id"] == self.current_session_id:
-                current_session = session
-                break
-        
+        current_session = self._current_session
         if current_session and current_session["activities"]:
             return current_session["activities"][-1]["subject"]
         
@@ -278,24 +371,22 @@ class PersonalizedKindergartenChatbot:
 
     def _generate_lesson(self, subject: str, difficulty: int) -> str:
         """Generate a personalized lesson based on subject and difficulty."""
-        if subject not in self.educational_content:
+        if subject not in CONTENT_SUBJECTS:
             return f"I'd love to help you with {subject}! Let's start with something fun and easy."
         
         # Get content for the difficulty level
-        content = self.educational_content[subject].get(difficulty, self.educational_content[subject][1])
+        content = self.educational_content.get((subject, difficulty)) or self.educational_content[(subject, 1)]
         
         # Select a random question
-        questions = content["questions"]
-        question = random.choice(questions)
+        question = self._rand.choice(content.questions)
         
         # Store the current question for answer processing
-        if not hasattr(self, '_current_question'):
-            self._current_question = {}
         self._current_question[subject] = {
             "question": question,
             "difficulty": difficulty,
             "start_time": time.time()
         }
+        self._awaiting_answer_subject = subject
         
         # Personalize the presentation based on learning style
         learning_style = self.current_student.get_preferred_learning_style()
@@ -309,10 +400,11 @@ class PersonalizedKindergartenChatbot:
 
     def _process_answer(self, user_input: str, subject: Optional[str]) -> str:
         """Process student's answer and provide feedback."""
-        if not subject or not hasattr(self, '_current_question') or subject not in self._current_question:
+        if subject not in self._current_question:
             return "That's interesting! What would you like to learn about next?"
         
         current_q = self._current_question[subject]
+        self._awaiting_answer_subject = None
         time_taken = time.time() - current_q["start_time"]
         
         # Simple answer evaluation (in a real system, this would be more sophisticated)
@@ -328,12 +420,34 @@ class PersonalizedKindergartenChatbot:
             time_taken
         )
         
-        # Save student progress
-        self.student_manager.save_student(self.current_student)
+        # Save student progress (batched)
+        self._unsaved_changes = True
+        self._unsaved_activities += 1
+        self._maybe_save_progress()
         
         # Generate feedback
         return self._generate_feedback(is_correct, time_taken, subject)
 
+    def _maybe_save_progress(self):
+        """
+        Save progress if enough activities or time have accumulated.
+        
+        Only called after an answer, so SAVE_INTERVAL is not a timer: an idle,
+        abandoned session keeps its buffered answers until start_session,
+        end_session or interpreter exit writes them (a hard kill loses them).
+        """
+        if (self._unsaved_activities >= SAVE_EVERY_ACTIVITIES
+                or time.monotonic() - self._last_save > SAVE_INTERVAL):
+            self.save_progress()
+
+    def save_progress(self):
+        """Write any unsaved progress for the current student to disk."""
+        if self._unsaved_changes and self.current_student:
+            self.student_manager.save_student(self.current_student)
+        self._unsaved_changes = False
+        self._unsaved_activities = 0
+        self._last_save = time.monotonic()
+
     def _evaluate_answer(self, user_input: str, subject: str, question_data: Dict) -> bool:
         """Evaluate if the student's answer is correct."""
         # This is a simplified evaluation - in a real system this would be much more sophisticated
@@ -342,19 +456,19 @@ class PersonalizedKindergartenChatbot:
         # For math questions, look for numbers
         if subject == "math":
             try:
-                if any(char.isdigit() for char in user_input):
+                if any(map(str.isdigit, user_input)):
                     return True  # Give credit for attempting math
             except:
                 pass
         
         # For reading/spelling, look for letter attempts
         if subject in ["reading", "spelling"]:
-            if any(char.isalpha() for char in user_input):
+            if any(map(str.isalpha, user_input)):
                 return True  # Give credit for attempting letters
         
         # For counting, look for number sequences
         if subject == "numbers":
-            if any(char.isdigit() for char in user_input) or "," in user_input:
+            if any(map(str.isdigit, user_input)) or "," in user_input:
                 return True  # Give credit for counting attempts
         
         # Default: give credit for attempting
@@ -366,31 +480,30 @@ class PersonalizedKindergartenChatbot:
         
         if is_correct:
             if time_taken < 30:
-                feedback = random.choice([
-                    "Wow! You're so quick and smart!",
-                    "Amazing! You got that super fast!",
-                    "Fantastic! You're a {subject} superstar!"
-                ]).format(subject=subject)
+                feedback = self._pick_response(FAST_CORRECT_FEEDBACK)
+                if feedback in SUBJECT_TEMPLATES:
+                    feedback = feedback.format(subject=subject)
             else:
-                feedback = random.choice([
-                    "Excellent work! You really thought about that!",
-                    "Great job! I can see you're thinking carefully!",
-                    "Perfect! Taking your time helped you get it right!"
-                ])
+                feedback = self._pick_response(SLOW_CORRECT_FEEDBACK)
         else:
             if encouragement_level == "high":
-                feedback = random.choice(self.encouragement_responses["high"])
+                feedback = self._pick_response(self.encouragement_responses["high"])
             else:
-                feedback = random.choice([
-                    "Good try! Let's work on this together!",
-                    "That's okay! Learning takes practice!",
-                    "Nice attempt! Let me help you with this!"
-                ])
+                feedback = self._pick_response(TRY_AGAIN_FEEDBACK)
         
         # Add a follow-up question or activity
         next_activity = self._suggest_next_activity(subject, is_correct)
         return f"{feedback} {next_activity}"
 
+    def _pick_response(self, pool: Tuple[str, ...]) -> str:
+        """Pick the next response from a pool, going through it in shuffled order."""
+        queue = self._response_queues.get(pool)
+        response = next(queue, None) if queue else None
+        if response is None:
+            queue = self._response_queues[pool] = iter(self._rand.sample(pool, len(pool)))
+            response = next(queue)
+        return response
+
     def _suggest_next_activity(self, subject: str, last_success: bool) -> str:
         """Suggest the next learning activity."""
         if self.current_student.is_frustrated():
@@ -404,32 +517,19 @@ class PersonalizedKindergartenChatbot:
     def _provide_encouragement(self) -> str:
         """Provide encouragement when student is frustrated."""
         encouragement_level = self.current_student.get_encouragement_level()
-        return random.choice(self.encouragement_responses[encouragement_level])
+        return self._pick_response(self.encouragement_responses[encouragement_level])
 
     def _suggest_break(self) -> str:
         """Suggest a break when student has been learning for too long."""
-        return random.choice([
-            "You've been working so hard! How about we take a little break? We can stretch or sing a song!",
-            "Great job learning today! Let's take a fun break and then come back to learning!",
-            "You're doing amazing! Want to take a quick break? We can play a movement game!"
-        ])
+        return self._pick_response(BREAK_SUGGESTIONS)
 
     def _generate_help_response(self) -> str:
         """Generate helpful response when student asks for help."""
-        return random.choice([
-            "I'm here to help you! What would you like to learn about? We can try math, reading, spelling, or numbers!",
-            "Of course I'll help! Tell me what you're curious about and we'll learn together!",
-            "I love helping! What sounds fun to you today - counting, letters, or maybe some math?"
-        ])
+        return self._pick_response(HELP_RESPONSES)
 
     def _generate_adaptive_response(self, user_input: str) -> str:
         """Generate adaptive response for general conversation."""
-        return random.choice([
-            "That's really interesting! Tell me more!",
-            "I love learning new things with you! What else are you thinking about?",
-            "You're so smart! What would you like to explore next?",
-            "That's a great thought! What would you like to learn about today?"
-        ])
+        return self._pick_response(ADAPTIVE_RESPONSES)
 
     def end_session(self) -> str:
         """End the current learning session."""
@@ -438,16 +538,12 @@ class PersonalizedKindergartenChatbot:
         
         # End the session
         self.current_student.end_session(self.current_session_id)
-        self.student_manager.save_student(self.current_student)
+        self._unsaved_changes = True
+        self.save_progress()
         
         # Generate personalized goodbye
         name = self.current_student.name
-        current_session = None
-        for session in self.current_student.sessions:
-            if session["session_id"] == self.current_session_id:
-                current_session = session
-                break
-        
+        current_session = self._current_session
         if current_session and current_session["activities"]:
             subjects = list(set(activity["subject"] for activity in current_session["activities"]))
             subject_list = ", ".join(subjects)
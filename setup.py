@@ -176,7 +176,12 @@ def test_and_install_optional_dependencies():
                 # Optional Dependencies Handling: Show fallback mechanism immediately
                 fallback = dep_status.get('spec', {}).get('fallback', 'Basic functionality maintained')
                 print(f"  💡 Fallback: {fallback}")
-                if dep_status.get('spec', {}).get('pip_package'):
+                # Performance packages (orjson, uvloop) only speed things up and
+                # must not take one of the limited install slots below; uvloop
+                # cannot be installed on Windows at all
+                if dep_status.get('spec', {}).get('category') == 'performance':
+                    print("  💡 Speed-up only: install manually if wanted (see OPTIONAL_DEPENDENCIES_GUIDE.md)")
+                elif dep_status.get('spec', {}).get('pip_package'):
                     missing_packages.append(dep_status['spec']['pip_package'])
         
         if missing_packages:
@@ -232,6 +237,7 @@ def test_and_install_optional_dependencies():
         
         # Network-resilient: Safe final status check
         try:
+            manager.invalidate_cache()  # Packages may have been installed above
             final_working, final_total, final_percentage = manager.get_summary_stats()
             print(f"\n📊 Final Status: {final_working}/{final_total} ({final_percentage:.0f}%) dependencies available")
         except Exception as e:
@@ -7,10 +7,36 @@ Tracks individual kindergarten students' learning progress, preferences, and per
 import json
 import os
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 import uuid
 
+# Optional Dependencies Handling: orjson reads/writes profiles faster; fall back to json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def read_profile_file(file_path: str) -> Dict:
+    """Read a student profile JSON file."""
+    if ORJSON_AVAILABLE:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_profile_file(file_path: str, data: Dict):
+    """Write a student profile JSON file (two-space indented, UTF-8)."""
+    if ORJSON_AVAILABLE:
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
 class KindergartenStudent:
     """Individual student profile for kindergarten learning."""
     
@@ -46,6 +72,8 @@ class KindergartenStudent:
         
         # Session history
         self.sessions = []
+        self._sessions_by_id = {}  # session_id -> session dict in self.sessions
+        self._activity_count = 0  # Running total of activities across all sessions
         self.last_active = datetime.now().isoformat()
         
         # Personalization settings
@@ -69,26 +97,24 @@ class KindergartenStudent:
             "engagement_level": "neutral"
         }
         self.sessions.append(session)
+        self._sessions_by_id[session_id] = session
         self.last_active = datetime.now().isoformat()
         return session_id
 
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        """Look up a session by its id."""
+        return self._sessions_by_id.get(session_id)
+
     def end_session(self, session_id: str):
         """End the current learning session."""
-        for session in self.sessions:
-            if session["session_id"] == session_id:
-                session["end_time"] = datetime.now().isoformat()
-                break
+        session = self._sessions_by_id.get(session_id)
+        if session:
+            session["end_time"] = datetime.now().isoformat()
 
     def record_activity(self, session_id: str, subject: str, activity: str, 
                        success: bool, difficulty: int, time_taken: float):
         """Record a learning activity result."""
-        # Find current session
-        current_session = None
-        for session in self.sessions:
-            if session["session_id"] == session_id:
-                current_session = session
-                break
-        
+        current_session = self._sessions_by_id.get(session_id)
         if not current_session:
             return
         
@@ -104,6 +130,7 @@ class KindergartenStudent:
         }
         
         current_session["activities"].append(activity_record)
+        self._activity_count += 1
         if subject not in current_session["subjects_covered"]:
             current_session["subjects_covered"].append(subject)
         
@@ -112,6 +139,11 @@ class KindergartenStudent:
         self._detect_learning_style(activity_record)
         self._update_engagement(success, time_taken)
 
+    @property
+    def total_activities(self) -> int:
+        """Total number of learning activities recorded across all sessions."""
+        return self._activity_count
+
     def _calculate_activity_score(self, success: bool, difficulty: int, time_taken: float) -> int:
         """Calculate score for an activity (0-100)."""
         if not success:
@@ -199,9 +231,15 @@ class KindergartenStudent:
         """Get the dominant learning style."""
         return max(self.learning_style.items(), key=lambda x: x[1])[0]
 
-    def needs_break(self, session_start: datetime) -> bool:
-        """Check if student needs a break based on attention span."""
-        session_duration = (datetime.now() - session_start).seconds
+    def needs_break(self, session_start: Union[float, datetime]) -> bool:
+        """Check if student needs a break based on attention span.
+        
+        session_start is a time.monotonic() reading or a datetime.
+        """
+        if isinstance(session_start, datetime):
+            session_duration = (datetime.now() - session_start).seconds
+        else:
+            session_duration = time.monotonic() - session_start
         return session_duration > self.engagement["attention_span"]
 
     def is_frustrated(self) -> bool:
@@ -246,6 +284,8 @@ class KindergartenStudent:
         student.learning_style = data["learning_style"]
         student.engagement = data["engagement"]
         student.sessions = data["sessions"]
+        student._sessions_by_id = {session["session_id"]: session for session in student.sessions}
+        student._activity_count = sum(len(session.get('activities', [])) for session in student.sessions)
         student.last_active = data["last_active"]
         student.preferences = data["preferences"]
         return student
@@ -278,8 +318,7 @@ class StudentProfileManager:
             return None
         
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            data = read_profile_file(file_path)
             student = KindergartenStudent.from_dict(data)
             self.active_students[student_id] = student
             return student
@@ -291,8 +330,7 @@ class StudentProfileManager:
         """Save a student profile to file."""
         file_path = os.path.join(self.profiles_dir, f"{student.student_id}.json")
         try:
-            with open(file_path, 'w') as f:
-                json.dump(student.to_dict(), f, indent=2)
+            write_profile_file(file_path, student.to_dict())
         except Exception as e:
             print(f"Error saving student profile {student.student_id}: {e}")
 
@@ -304,8 +342,7 @@ class StudentProfileManager:
                 student_id = filename[:-5]  # Remove .json extension
                 file_path = os.path.join(self.profiles_dir, filename)
                 try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
+                    data = read_profile_file(file_path)
                     students.append({
                         "student_id": student_id,
                         "name": data["name"],
@@ -319,6 +356,28 @@ class StudentProfileManager:
         students.sort(key=lambda x: x["last_active"], reverse=True)
         return students
 
+    def load_all_students(self) -> List[KindergartenStudent]:
+        """Load every student profile in one pass, most recently active first."""
+        students = []
+        for filename in os.listdir(self.profiles_dir):
+            if filename.endswith('.json'):
+                student_id = filename[:-5]  # Remove .json extension
+                if student_id in self.active_students:
+                    students.append(self.active_students[student_id])
+                    continue
+                
+                file_path = os.path.join(self.profiles_dir, filename)
+                try:
+                    data = read_profile_file(file_path)
+                    student = KindergartenStudent.from_dict(data)
+                    self.active_students[student_id] = student
+                    students.append(student)
+                except Exception as e:
+                    print(f"Error loading student profile {student_id}: {e}")
+        
+        students.sort(key=lambda student: student.last_active, reverse=True)
+        return students
+
     def get_student_by_name(self, name: str) -> Optional[KindergartenStudent]:
         """Find student by name."""
         for student_info in self.list_students():
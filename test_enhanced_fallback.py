@@ -5,9 +5,6 @@ This script tests the enhanced functionality added to setup.py.
 """
 
 import sys
-import subprocess
-import tempfile
-import os
 
 def test_builtin_dependency_detection():
     """Test that the enhanced fallback can detect built-in dependencies."""
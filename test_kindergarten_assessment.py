@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the Teacher1 kindergarten assessment tool.
+"""
+
+import shutil
+import tempfile
+import unittest
+
+from kindergarten_assessment import KindergartenAssessment
+from student_profile import StudentProfileManager
+
+
+class TestKindergartenAssessment(unittest.TestCase):
+    """Test the per-student assessment cache."""
+
+    def setUp(self):
+        self.profiles_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profiles_dir)
+        self.assessor = KindergartenAssessment()
+        self.assessor.student_manager = StudentProfileManager(self.profiles_dir)
+
+        student = self.assessor.student_manager.create_student("Test Student")
+        self.session_id = session_id = student.start_session()
+        student.record_activity(session_id, "math", "Count to 3", True, 1, 5.0)
+        student.record_activity(session_id, "reading", "Letter A sound", False, 1, 12.0)
+        student.end_session(session_id)
+        self.assessor.student_manager.save_student(student)
+
+    def test_editing_result_does_not_change_cache(self):
+        """Test that mutating a returned assessment leaves the cached one intact."""
+        first = self.assessor.assess_student("Test Student")
+        expected_recommendations = list(first["recommendations"])
+        expected_progress = dict(first["academic_progress"])
+
+        first["recommendations"].append("edited by caller")
+        first["academic_progress"].clear()
+        first["learning_profile"]["primary_learning_style"] = "edited"
+
+        second = self.assessor.assess_student("Test Student")
+        self.assertEqual(second["recommendations"], expected_recommendations)
+        self.assertEqual(second["academic_progress"], expected_progress)
+        self.assertNotEqual(second["learning_profile"]["primary_learning_style"], "edited")
+
+        # The cached copy must survive edits to a cache hit as well
+        second["recommendations"].clear()
+        third = self.assessor.assess_student("Test Student")
+        self.assertEqual(third["recommendations"], expected_recommendations)
+
+    def test_off_progress_activity_refreshes_cache(self):
+        """Test that an activity outside the tracked subjects still invalidates the cache."""
+        first = self.assessor.assess_student("Test Student")
+        self.assertEqual(first["engagement_analysis"]["frustration_indicators"], 0)
+
+        # "art" has no progress entry, so subject attempts stay the same, but a
+        # long unsuccessful attempt still counts as a frustration indicator
+        student = self.assessor.student_manager.get_student_by_name("Test Student")
+        student.record_activity(self.session_id, "art", "Draw a circle", False, 1, 200.0)
+        self.assessor.student_manager.save_student(student)
+
+        second = self.assessor.assess_student("Test Student")
+        self.assertEqual(second["engagement_analysis"]["frustration_indicators"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
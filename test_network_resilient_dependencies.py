@@ -12,7 +12,6 @@ Tests the enhanced optional dependency handling system to ensure it properly han
 import sys
 import subprocess
 import time
-import os
 
 def test_network_resilient_setup():
     """Test that setup script doesn't hang or crash on network issues."""
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the Teacher1 personalized kindergarten chatbot.
+"""
+
+import shutil
+import tempfile
+import unittest
+
+import personalized_chatbot
+from personalized_chatbot import PersonalizedKindergartenChatbot
+from student_profile import StudentProfileManager
+
+
+class TestPersonalizedChatbot(unittest.TestCase):
+    """Test intent detection and answer handling."""
+
+    def setUp(self):
+        self.profiles_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profiles_dir)
+        self.chatbot = PersonalizedKindergartenChatbot()
+        self.chatbot.student_manager = StudentProfileManager(self.profiles_dir)
+
+    def test_intent_detection(self):
+        """Test that intents are matched on whole words and phrases."""
+        test_cases = [
+            ("Hello!", ("greeting", None)),
+            ("good morning", ("greeting", None)),
+            ("help me hi", ("greeting", None)),
+            ("I don't know", ("help", None)),
+            ("I want to learn math", ("lesson_request", "math")),
+            ("Can we do reading?", ("lesson_request", "reading")),
+            ("letters please", ("lesson_request", "spelling")),
+            ("counting", ("lesson_request", "numbers")),
+            ("this is too hard", ("encouragement_needed", None)),
+            ("I don't want to", ("encouragement_needed", None)),
+            # Keywords inside other words must not match
+            ("this", ("answer", None)),
+            ("ladder", ("answer", None)),
+            ("shard", ("answer", None)),
+        ]
+
+        for user_input, expected in test_cases:
+            with self.subTest(user_input=user_input):
+                self.assertEqual(self.chatbot._analyze_input(user_input), expected)
+
+    def test_answer_goes_to_pending_question(self):
+        """Test that the first answer after a lesson is recorded for its subject."""
+        self.chatbot.start_session("Test Student")
+        _, metadata = self.chatbot.get_response("I want to learn math")
+        self.assertEqual(metadata, {"lesson_started": True, "subject": "math"})
+
+        response, metadata = self.chatbot.get_response("4")
+        self.assertEqual(metadata, {"answer_processed": True})
+        self.assertIn("math", response)
+        self.assertEqual(self.chatbot.current_student.progress["math"]["attempts"], 1)
+
+        self.chatbot.end_session()
+
+    def _answer_math_questions(self, count):
+        """Answer count math questions without ending the session."""
+        for _ in range(count):
+            self.chatbot.get_response("I want to learn math")
+            self.chatbot.get_response("4")
+
+    def _saved_math_attempts(self, name):
+        """Read the math attempts stored on disk for a student."""
+        student = StudentProfileManager(self.profiles_dir).get_student_by_name(name)
+        return student.progress["math"]["attempts"]
+
+    def test_unended_session_saved_at_exit(self):
+        """Test that fewer than SAVE_EVERY_ACTIVITIES answers reach disk at exit."""
+        self.chatbot.start_session("Test Student")
+        self._answer_math_questions(2)
+        self.assertEqual(self._saved_math_attempts("Test Student"), 0)
+
+        # The atexit hook flushes sessions that were never ended
+        personalized_chatbot._save_all_progress()
+        self.assertEqual(self._saved_math_attempts("Test Student"), 2)
+
+    def test_buffered_progress_saved_on_session_switch(self):
+        """Test that starting another session writes the previous student's answers."""
+        self.chatbot.start_session("First Student")
+        self._answer_math_questions(3)
+        self.chatbot.start_session("Second Student")
+        self.assertEqual(self._saved_math_attempts("First Student"), 3)
+
+    def test_count_save_restarts_after_session_switch(self):
+        """Test that a full batch of answers is buffered again after any save."""
+        self.chatbot.start_session("Test Student")
+        self._answer_math_questions(3)
+        self.chatbot.start_session("Other Student")
+        self.chatbot.start_session("Test Student")
+
+        # Answers 4 and 5 overall are only 1 and 2 since the last save
+        self._answer_math_questions(2)
+        self.assertEqual(self._saved_math_attempts("Test Student"), 3)
+
+        self._answer_math_questions(3)
+        self.assertEqual(self._saved_math_attempts("Test Student"), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,6 @@ the Fractal AI system and chatbot components.
 
 import asyncio
 import logging
-import time
 import sys
 import os
 
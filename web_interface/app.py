@@ -43,6 +43,25 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fallback replies in priority order: the first pattern found anywhere in the
+# lowercased message wins (substring matching, so 'hi' also matches 'this')
+FALLBACK_REPLIES = (
+    (re.compile(r"math|mathematics|calculation"),
+     "I'd love to help you with math! I can show you educational math resources. Try asking me to 'show math content' or 'open math learning resources'."),
+    (re.compile(r"science|experiment|physics|chemistry|biology"),
+     "Science is fascinating! I can show you educational science content. Ask me to 'display science information' or 'show science resources'."),
+    (re.compile(r"history|historical|past"),
+     "History helps us understand our world! I can show you historical content. Try saying 'show history content' or 'open historical resources'."),
+    (re.compile(r"read|reading|story|book"),
+     "Reading is fundamental! I can show you reading games and resources. Ask me to 'show reading content' or 'open reading games'."),
+    (re.compile(r"hello|hi|hey|greetings"),
+     "Hello! I'm your learning assistant. I can help you explore educational content! Try asking me to show you content about math, science, history, or reading."),
+    (re.compile(r"help|what can you do"),
+     "I can help you learn by showing educational content! I can display websites about math, science, history, reading, and more. Just ask me to 'show content about [topic]' or 'open [topic] resources'."),
+)
+FALLBACK_DEFAULT_REPLY = "That's interesting! I can show you educational content on many topics. Try asking me to 'show educational content about science' or 'open math learning resources'."
+
+
 class Teacher1WebInterface:
     """Web interface for Teacher1 chatbot with embedded content support"""
     
@@ -75,7 +94,8 @@ class Teacher1WebInterface:
         # Initialize HuggingFace chatbot as conversational option
         if HUGGINGFACE_CHATBOT_AVAILABLE:
             try:
-                self.huggingface_chatbot = HuggingFaceBlenderBotChatbot()
+                # Load BlenderBot in the background so the server starts serving at once
+                self.huggingface_chatbot = HuggingFaceBlenderBotChatbot(background_load=True)
                 logger.info("HuggingFace chatbot initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize HuggingFace chatbot: {e}")
@@ -443,28 +463,10 @@ class Teacher1WebInterface:
     def get_fallback_response(self, message: str) -> str:
         """Generate fallback response when chatbot is not available"""
         message_lower = message.lower()
-        
-        # Educational responses
-        if any(word in message_lower for word in ['math', 'mathematics', 'calculation']):
-            return "I'd love to help you with math! I can show you educational math resources. Try asking me to 'show math content' or 'open math learning resources'."
-        
-        elif any(word in message_lower for word in ['science', 'experiment', 'physics', 'chemistry', 'biology']):
-            return "Science is fascinating! I can show you educational science content. Ask me to 'display science information' or 'show science resources'."
-        
-        elif any(word in message_lower for word in ['history', 'historical', 'past']):
-            return "History helps us understand our world! I can show you historical content. Try saying 'show history content' or 'open historical resources'."
-        
-        elif any(word in message_lower for word in ['read', 'reading', 'story', 'book']):
-            return "Reading is fundamental! I can show you reading games and resources. Ask me to 'show reading content' or 'open reading games'."
-        
-        elif any(word in message_lower for word in ['hello', 'hi', 'hey', 'greetings']):
-            return "Hello! I'm your learning assistant. I can help you explore educational content! Try asking me to show you content about math, science, history, or reading."
-        
-        elif any(word in message_lower for word in ['help', 'what can you do']):
-            return "I can help you learn by showing educational content! I can display websites about math, science, history, reading, and more. Just ask me to 'show content about [topic]' or 'open [topic] resources'."
-        
-        else:
-            return "That's interesting! I can show you educational content on many topics. Try asking me to 'show educational content about science' or 'open math learning resources'."
+        for pattern, reply in FALLBACK_REPLIES:
+            if pattern.search(message_lower):
+                return reply
+        return FALLBACK_DEFAULT_REPLY
     
     def get_timestamp(self) -> str:
         """Get current timestamp"""
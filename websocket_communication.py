@@ -204,10 +204,17 @@ class WebSocketCommunicator:
             except Exception as e:
                 logger.error(f"Error in ack handler: {e}")
     
-    async def _send_to_websocket(self, websocket, message: dict):
-        """Send message to specific websocket."""
+    async def _send_to_websocket(self, websocket, message: dict, payload: Optional[str] = None):
+        """
+        Send message to specific websocket.
+        
+        Args:
+            websocket: Target websocket connection
+            message: Structured message dictionary
+            payload: Pre-serialized JSON for message (serialized here if omitted)
+        """
         try:
-            await websocket.send(json.dumps(message))
+            await websocket.send(payload if payload is not None else json.dumps(message))
             logger.info(f"Sent {message['type']} to {websocket.remote_address}")
         except ConnectionClosed:
             logger.warning("Connection closed while sending message")
@@ -220,14 +227,20 @@ class WebSocketCommunicator:
             logger.warning("No connected clients to broadcast to")
             return
         
+        # Serialize once and write the frame to all clients concurrently
+        payload = json.dumps(message)
+        clients = list(self.connected_clients)
+        results = await asyncio.gather(
+            *(self._send_to_websocket(client, message, payload) for client in clients),
+            return_exceptions=True
+        )
+        
         disconnected_clients = set()
-        for client in self.connected_clients:
-            try:
-                await self._send_to_websocket(client, message)
-            except ConnectionClosed:
+        for client, result in zip(clients, results):
+            if isinstance(result, ConnectionClosed):
                 disconnected_clients.add(client)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
+            elif isinstance(result, Exception):
+                logger.error(f"Error broadcasting to client: {result}")
                 disconnected_clients.add(client)
         
         # Clean up disconnected clients